@@ -1,11 +1,7 @@
 # --- main app.py ---
+import importlib
 import streamlit as st
-import pandas as pd
-from tabs import overview
-from tabs import live_stream
-from tabs import manual_entry
-from tabs import metrics
-from tabs import historical
+from core.telemetry import start_metrics_server
 
 st.set_page_config(page_title="Anomaly Detection Dashboard", layout="wide")
 
@@ -30,27 +26,44 @@ time_range = st.sidebar.selectbox("Time Range", list(time_range_query_map.keys()
 thresh = st.sidebar.slider("Anomaly Threshold", 0.01, 1.0, 0.1, 0.01)
 highlight_color = st.sidebar.selectbox("Highlight Color", ["Red", "Orange", "Yellow", "Green", "Blue"], index=3)
 alerts_enabled = st.sidebar.checkbox("Enable Discord Alerts", value=True)
+scoring_backend = st.sidebar.radio("Scoring Backend", ["Remote API", "Local model"], horizontal=True)
 
 # --- State Initialization ---
-if "predictions" not in st.session_state:
-    st.session_state.predictions = []
-if "attacks" not in st.session_state:
-    st.session_state.attacks = []
+# Live prediction history lives in per-type ring buffers (tabs.ring_buffer.get_live_buffer),
+# created lazily on first use.
 
-# --- Tabs Navigation ---
-tabs = st.tabs(["Overview", "Live Stream", "Manual Entry", "Metrics", "Historical Data"])
+# --- Instrumentation ---
+# Prometheus text on a local port when METRICS_PORT is set; the Performance tab is hidden behind ?perf=1
+metrics_port = st.secrets.get("METRICS_PORT")
+if metrics_port:
+    start_metrics_server(metrics_port)
+show_performance = st.query_params.get("perf") == "1"
 
-with tabs[0]:
-    overview.render(time_range, time_range_query_map, traffic_type)
-
-with tabs[1]:
-    live_stream.render(thresh, highlight_color, alerts_enabled, traffic_type)
-
-with tabs[2]:
-    manual_entry.render(traffic_type)
+# --- View Navigation ---
+# st.tabs runs every tab's body on each rerun; with a view switcher only the selected
+# view's module is imported (plotly, pyarrow, ... on first use) and only it queries and draws.
+VIEWS = {
+    "Overview": "overview",
+    "Live Stream": "live_stream",
+    "Manual Entry": "manual_entry",
+    "Metrics": "metrics",
+    "Historical Data": "historical",
+}
+if show_performance:
+    VIEWS["Performance"] = "performance"
 
-with tabs[3]:
-    metrics.render(thresh, traffic_type)
+view = st.radio("View", list(VIEWS), horizontal=True, key="view", label_visibility="collapsed")
+page = importlib.import_module(f"tabs.{VIEWS[view]}")
 
-with tabs[4]:
-    historical.render(thresh, highlight_color, traffic_type)
+if view == "Overview":
+    page.render(time_range, time_range_query_map, traffic_type)
+elif view == "Live Stream":
+    page.render(thresh, highlight_color, alerts_enabled, traffic_type, scoring_backend)
+elif view == "Manual Entry":
+    page.render(traffic_type, scoring_backend)
+elif view == "Metrics":
+    page.render(thresh, traffic_type)
+elif view == "Historical Data":
+    page.render(thresh, highlight_color, traffic_type)
+else:
+    page.render(metrics_port)
@@ -0,0 +1,178 @@
+# --- Historical Re-scoring (Backfill) ---
+# Re-scores stored predictions with the local model, e.g. after a model update.
+# The range is cut into time shards; a process pool scores them with the model
+# loaded once per worker process, and the parent writes each shard back in one
+# transaction (scores, rollups, progress), so a rerun resumes after the last
+# completed shard.
+# Run with: python backfill.py --kind dns [--start 2024-01-01 --end 2024-01-31] [--workers 4]
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+import pandas as pd
+from core import FeaturePipeline, LocalScorer, get_schema, get_store
+from core.config import DATABASE_PATH
+from core.local_scorer import MODEL_PATHS
+from core.retention import raw_coverage_start, refold_rollups
+from core.store import TABLES, PredictionStore, bump_revision, format_timestamp
+
+SHARD_HOURS = 6
+IN_FLIGHT_PER_WORKER = 2  # scored shards waiting to be written stay bounded
+
+
+def plan_shards(start, end, shard_hours=SHARD_HOURS):
+    """[(shard start, shard end), ...] covering [start, end), cut on hour boundaries."""
+    edges = pd.date_range(pd.Timestamp(start).floor("h"), pd.Timestamp(end), freq=f"{shard_hours}h")
+    edges = list(edges) + ([edges[-1] + pd.Timedelta(hours=shard_hours)] if edges[-1] < end else [])
+    return [(a.to_pydatetime(), b.to_pydatetime()) for a, b in zip(edges[:-1], edges[1:])]
+
+
+def job_name(kind, start, shard_hours, model_path):
+    # Shard edges only depend on the first one, so a later end (new rows) still resumes;
+    # a retrained model file (new mtime) is a new job. Without an explicit start the key
+    # says "auto": retention keeps moving MIN(timestamp), so it cannot be part of the key.
+    model = f"{os.path.basename(model_path)}@{int(os.path.getmtime(model_path))}"
+    first = "auto" if start is None else format_timestamp(pd.Timestamp(start).floor("h"))
+    return f"{kind}|{first}|{shard_hours}h|{model}"
+
+
+# --- Worker Processes ---
+_worker = {}
+
+
+def _init_worker(db_path, kind, model_path):
+    # Runs once per process: one store connection and one loaded model for all its shards.
+    # A fresh PredictionStore, not get_store(): SQLite connections must not cross a fork.
+    _worker["store"] = PredictionStore(db_path)
+    _worker["scorer"] = LocalScorer(get_schema(kind), path=model_path)
+    _worker["kind"] = kind
+
+
+def _score_shard(shard):
+    store, scorer, kind = _worker["store"], _worker["scorer"], _worker["kind"]
+    raw = list(scorer.schema.features)
+    df = store.read_range(kind, shard[0], shard[1], columns=", ".join(["id", "timestamp", *raw]))
+    if scorer.derived_features:
+        # Model reads rolling features: warm them on the rows just before the shard
+        pipeline = FeaturePipeline(raw)
+        pipeline.transform(store.read_page(kind, end=shard[0], limit=pipeline.warmup_rows, order="DESC").iloc[::-1])
+        df = pipeline.transform(df)
+    anomaly, score, _ = scorer.score(df)
+    return shard, df["id"].to_numpy(), anomaly, score
+
+
+# --- Writer ---
+def write_shard(store, kind, job, shard, ids, anomaly, score):
+    """Scores, refolded rollups, the table revision and the progress row for one shard, in one transaction."""
+    conn = store.connection()
+    with conn:
+        conn.executemany(
+            f"UPDATE {TABLES[kind]} SET anomaly_score = ?, reconstruction_error = ?, is_anomaly = ? WHERE id = ?",
+            zip(score.tolist(), score.tolist(), anomaly.astype(int).tolist(), ids.tolist()),
+        )
+        refold_rollups(conn, kind, *shard)
+        bump_revision(conn, kind)  # exports built before this shard are stale
+        conn.execute("INSERT OR REPLACE INTO backfill_progress (job, shard_start, rows, finished) VALUES (?, ?, ?, ?)",
+                     (job, format_timestamp(shard[0]), len(ids), time.time()))
+    return len(ids)
+
+
+def completed_shards(store, job):
+    rows = store.connection().execute("SELECT shard_start FROM backfill_progress WHERE job = ?", (job,)).fetchall()
+    return {r[0] for r in rows}
+
+
+def resolve_range(store, kind, job, start, end):
+    """(start, end) for the job: explicit values, else the ones its first run stored, else the table's."""
+    conn = store.connection()
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        stored = conn.execute("SELECT range_start, range_end FROM backfill_jobs WHERE job = ?", (job,)).fetchone()
+        if stored is None:
+            first, last = conn.execute(f"SELECT MIN(timestamp), MAX(timestamp) FROM {TABLES[kind]}").fetchone()
+            if first is None and (start is None or end is None):
+                return None
+            stored = (format_timestamp(start if start is not None else first),
+                      format_timestamp(end if end is not None else pd.Timestamp(last) + pd.Timedelta(microseconds=1)))
+            conn.execute("INSERT INTO backfill_jobs (job, kind, range_start, range_end, created) VALUES (?, ?, ?, ?, ?)",
+                         (job, kind, *stored, time.time()))
+    start = start if start is not None else pd.Timestamp(stored[0]).to_pydatetime()
+    end = end if end is not None else pd.Timestamp(stored[1]).to_pydatetime()
+    return start, end
+
+
+def run_backfill(kind, start=None, end=None, shard_hours=SHARD_HOURS, workers=None, db_path=DATABASE_PATH,
+                 model_path=None, job=None, restart=False):
+    store = get_store(db_path)
+    model_path = model_path or MODEL_PATHS[kind]
+    job = job or job_name(kind, start, shard_hours, model_path)
+    if restart:
+        with store.connection() as conn:
+            conn.execute("DELETE FROM backfill_progress WHERE job = ?", (job,))
+            conn.execute("DELETE FROM backfill_jobs WHERE job = ?", (job,))
+    resolved = resolve_range(store, kind, job, start, end)
+    if resolved is None:
+        print(f"No stored {kind} predictions to re-score.")
+        return 0
+    start, end = resolved
+
+    shards = plan_shards(start, end, shard_hours)
+    # Only hours that raw rows fully cover are re-scored; older hours live on in the rollups alone
+    covered = raw_coverage_start(store.connection(), kind)
+    shards = [] if covered is None else [(max(a, covered), b) for a, b in shards if b > covered]
+    if covered is not None and covered > start:
+        skipped = store.count_range(kind, start, covered)
+        if skipped:
+            print(f"Skipping {skipped:,} rows before {covered:%Y-%m-%d %H:%M}: their hour was partly purged "
+                  f"and only survives in the rollups")
+    done = completed_shards(store, job)
+    pending = [s for s in shards if format_timestamp(s[0]) not in done]
+    workers = workers or os.cpu_count() or 1
+    print(f"Job {job}: {start:%Y-%m-%d %H:%M} to {end:%Y-%m-%d %H:%M}, {len(shards)} shards, "
+          f"{len(shards) - len(pending)} already done, {workers} workers")
+    print(f"Resume with: --job '{job}'")
+
+    started, rows, finished = time.time(), 0, len(shards) - len(pending)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(db_path, kind, model_path)) as executor:
+        queue, in_flight = iter(pending), set()
+        while True:
+            while len(in_flight) < workers * IN_FLIGHT_PER_WORKER:
+                shard = next(queue, None)
+                if shard is None:
+                    break
+                in_flight.add(executor.submit(_score_shard, shard))
+            if not in_flight:
+                break
+            ready, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in ready:
+                shard, ids, anomaly, score = future.result()
+                rows += write_shard(store, kind, job, shard, ids, anomaly, score)
+                finished += 1
+                elapsed = time.time() - started
+                print(f"{datetime.now():%H:%M:%S} [{finished}/{len(shards)}] {shard[0]:%Y-%m-%d %H:%M} "
+                      f"{len(ids):,} rows · {rows:,} total · {rows / elapsed if elapsed else 0:,.0f} rows/s")
+    print(f"Re-scored {rows:,} {kind} rows in {time.time() - started:.1f}s")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score stored predictions with the local model.")
+    parser.add_argument("--kind", choices=list(TABLES), required=True)
+    parser.add_argument("--start", type=pd.Timestamp, help="first timestamp (default: oldest stored row)")
+    parser.add_argument("--end", type=pd.Timestamp, help="exclusive end (default: newest stored row)")
+    parser.add_argument("--shard-hours", type=int, default=SHARD_HOURS)
+    parser.add_argument("--workers", type=int, help="processes (default: all cores)")
+    parser.add_argument("--model", help="model file (default: MODEL_DIR/<kind>_model.joblib)")
+    parser.add_argument("--db", default=DATABASE_PATH)
+    parser.add_argument("--job", help="progress key to resume, as printed by an earlier run "
+                                      "(default: derived from --start, shards and model)")
+    parser.add_argument("--restart", action="store_true", help="forget completed shards and start over")
+    args = parser.parse_args()
+    run_backfill(args.kind, args.start and args.start.to_pydatetime(), args.end and args.end.to_pydatetime(),
+                 args.shard_hours, args.workers, args.db, args.model, args.job, args.restart)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+# --- Benchmarks ---
+# Synthetic traffic, in-process fakes for InfluxDB and the prediction API,
+# and a runner that times the data paths and tab renders at growing sizes.
+# Run with: python -m benchmarks.run [--sizes 1000 100000] [--baseline report.json]
+# Cold import cost per view: python -m benchmarks.imports
@@ -0,0 +1,117 @@
+import re
+import socket
+import threading
+import time
+import joblib
+import numpy as np
+import pandas as pd
+import uvicorn
+from sklearn.ensemble import IsolationForest
+from core.store import TABLES, TIMESTAMP_FORMAT
+
+# --- Fake InfluxDB ---
+# Answers the Flux queries built by core.influx_stream from in-memory frames,
+# honouring range(start:), limit(n:) and aggregateWindow(every:, fn:).
+
+_DURATION = re.compile(r"^-(\d+)([smhdw])$")
+_UNITS = {"s": "s", "m": "min", "h": "h", "d": "D", "w": "W"}
+
+
+def _range_start(query, now):
+    start = re.search(r"range\(start: ([^)]+)\)", query).group(1).strip()
+    match = _DURATION.match(start)
+    if match:
+        return now - pd.Timedelta(int(match.group(1)), _UNITS[match.group(2)])
+    return pd.Timestamp(start)
+
+
+class FakeQueryApi:
+    def __init__(self, frames, now=None):
+        self.frames = frames  # (bucket, measurement) -> DataFrame with timestamp + fields
+        # Relative ranges count back from the newest point, so seeding time doesn't empty "-30s"
+        self.now = now if now is not None else max(df["timestamp"].max() for df in frames.values())
+
+    def _select(self, query):
+        bucket = re.search(r'from\(bucket: "([^"]+)"\)', query).group(1)
+        measurement = re.search(r'r._measurement == "([^"]+)"', query).group(1)
+        fields = re.findall(r'r._field == "([^"]+)"', query)
+        df = self.frames[(bucket, measurement)]
+        df = df[df["timestamp"] >= _range_start(query, self.now)]
+        window = re.search(r"aggregateWindow\(every: (\d+)([smhdw]), fn: (\w+)", query)
+        if window:
+            rule = f"{window.group(1)}{_UNITS[window.group(2)]}"
+            df = df.set_index("timestamp")[fields].resample(rule).agg(window.group(3)).dropna().reset_index()
+        limit = re.search(r"limit\(n:(\d+)\)", query)
+        if limit:
+            df = df.head(int(limit.group(1)))
+        return df, fields
+
+    def query_csv(self, query, dialect=None):
+        df, fields = self._select(query)
+        yield ["", "result", "table", "_time"] + fields
+        times = df["timestamp"].dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ").to_numpy()
+        values = [df[f].to_numpy().astype(str) for f in fields]
+        for i in range(len(df)):
+            yield ["", "_result", "0", times[i]] + [v[i] for v in values]
+
+    def query_data_frame(self, query):
+        df, fields = self._select(query)
+        return df[["timestamp"] + fields].rename(columns={"timestamp": "_time"})
+
+
+class FakeInfluxClient:
+    def __init__(self, frames, now=None):
+        self._query_api = FakeQueryApi(frames, now)
+
+    def query_api(self):
+        return self._query_api
+
+
+# --- Fake Prediction API ---
+def start_stub_api(host="127.0.0.1"):
+    """Serve stub_api in a daemon thread; returns its base URL."""
+    from stub_api import app
+
+    with socket.socket() as s:
+        s.bind((host, 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="stub-api", daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://{host}:{port}"
+
+
+def train_local_model(path, frame, features, seed=0):
+    """Small IsolationForest bundle in the format core.local_scorer.load_model reads."""
+    sample = frame.sample(min(len(frame), 10_000), random_state=seed)
+    model = IsolationForest(n_estimators=50, random_state=seed).fit(sample[features].to_numpy())
+    joblib.dump({"model": model, "features": features, "threshold": None}, path)
+    return path
+
+
+# --- Seeded State ---
+LIVE_SEED = {}  # label -> scored rows the Metrics tab starts from (AppTest runs in this process)
+
+
+
+def seed_store(store, kind, frame, features, chunk_rows=200_000):
+    """Bulk-load scored rows straight through executemany (no per-record dicts)."""
+    table = TABLES[kind]
+    columns = ["timestamp", *features, "anomaly_score", "reconstruction_error", "is_anomaly", "is_attack"]
+    conn = store.connection()
+    rng = np.random.default_rng(len(frame))
+    with conn:
+        for start in range(0, len(frame), chunk_rows):
+            chunk = frame.iloc[start:start + chunk_rows]
+            score = np.where(chunk["is_attack"] == 1, rng.uniform(0.5, 1.0, len(chunk)), rng.uniform(0.0, 0.6, len(chunk)))
+            data = [
+                chunk["timestamp"].dt.tz_convert("UTC").dt.tz_localize(None).dt.strftime(TIMESTAMP_FORMAT).tolist(),
+                *[chunk[f].tolist() for f in features],
+                score.tolist(), score.tolist(), (score > 0.5).astype(int).tolist(), chunk["is_attack"].tolist(),
+            ]
+            conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                zip(*data),
+            )
+    return len(frame)
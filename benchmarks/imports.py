@@ -0,0 +1,71 @@
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+
+# --- Import-time Report ---
+# Cold-imports each dashboard module in a fresh interpreter with -X importtime
+# and reports its cumulative cost plus the heaviest top-level packages it pulls
+# in. "all views" is what app.py paid up front when every tab was imported.
+# Run with: python -m benchmarks.imports [--repeat 3] [--out imports.json]
+
+VIEWS = ("overview", "live_stream", "manual_entry", "metrics", "historical", "performance")
+TARGETS = {
+    "core": ["core"],
+    "tabs": ["tabs"],
+    **{f"view.{view}": [f"tabs.{view}"] for view in VIEWS},
+    "all views": [f"tabs.{view}" for view in VIEWS],
+}
+BASELINE = ["streamlit", "pandas", "numpy"]  # paid by any Streamlit page; excluded from the totals
+TOP_PACKAGES = 5
+
+
+def import_times(modules):
+    """{module: (self us, cumulative us)} for a cold import of `modules` after the baseline."""
+    code = "; ".join(f"import {name}" for name in [*BASELINE, *modules])
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        times[name] = (int(self_us), int(cumulative))
+    return times
+
+
+def measure(modules, baseline_names):
+    times = import_times(modules)
+    new = {name: t for name, t in times.items() if name not in baseline_names}
+    total = sum(self_us for self_us, _ in new.values())
+    packages = defaultdict(int)
+    for name, (self_us, _) in new.items():
+        packages[name.split(".")[0]] += self_us
+    top = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:TOP_PACKAGES]
+    return {"seconds": total / 1e6, "modules": len(new), "top": [(name, us / 1e6) for name, us in top]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import cost of the dashboard modules.")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per target; the fastest is kept")
+    parser.add_argument("--out", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    baseline_names = set(import_times([]))
+    report = {"baseline": BASELINE, "results": {}}
+    for target, modules in TARGETS.items():
+        runs = [measure(modules, baseline_names) for _ in range(args.repeat)]
+        best = min(runs, key=lambda r: r["seconds"])
+        report["results"][target] = best
+        top = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in best["top"])
+        print(f"  {target:<20} {best['seconds']:7.3f}s  {best['modules']:5d} modules  ({top})")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
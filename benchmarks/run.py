@@ -0,0 +1,187 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from streamlit.testing.v1 import AppTest
+import core.sources
+import tabs
+import tabs.live_stream
+from core import CachedScorer, FeaturePipeline, InfluxSource, LocalScorer, add_features, get_schema, get_scorer, get_store
+from core.prediction_cache import PredictionCache
+from core.retention import update_rollups
+from core.telemetry import telemetry
+from tabs.ring_buffer import LIVE_CAPACITY
+from benchmarks.fakes import LIVE_SEED, FakeInfluxClient, seed_store, start_stub_api, train_local_model
+from benchmarks.synthetic import generate_traffic
+
+# --- Benchmark Runner ---
+# For each size: generate traffic, serve it from a fake InfluxDB, seed a fresh
+# SQLite store, then time the data paths and every tab's render against them.
+# Each case records the first (cold-cache) run and the median of all runs.
+
+DEFAULT_SIZES = (1_000, 100_000, 10_000_000)
+DEFAULT_REPEAT = 3
+FAKE_INFLUX = ("http://fake-influx", "bench-token", "bench-org")
+NOISE_FLOOR = 0.005  # seconds; smaller differences never count as regressions
+FEATURE_TICK_ROWS = 200  # a live refresh's worth of new points
+TAB_SCRIPTS = ("overview", "live_stream", "manual_entry", "metrics", "historical")
+
+
+def timed(fn, repeat):
+    runs, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        runs.append(time.perf_counter() - started)
+    return runs, result
+
+
+def _tab_script(tab, label, db_path):
+    # Runs inside AppTest; only its source and arguments are shipped, so imports live here.
+    import importlib
+    import tabs
+    import tabs.live_stream
+    from benchmarks.fakes import LIVE_SEED
+    from tabs.ring_buffer import get_live_buffer
+
+    tabs.DATABASE_PATH = tabs.live_stream.DATABASE_PATH = db_path
+    module = importlib.import_module(f"tabs.{tab}")
+    if tab == "overview":
+        module.render("Last 30 days", {"Last 30 days": "-30d"}, label)
+    elif tab == "live_stream":
+        module.render(0.5, "Red", False, label)
+    elif tab == "manual_entry":
+        module.render(label)
+    elif tab == "metrics":
+        get_live_buffer(label).append(LIVE_SEED[label])
+        module.render(0.5, label)
+    else:
+        module.render(0.5, "Red", label)
+
+
+def render_tab(tab, label, db_path, api_url):
+    at = AppTest.from_function(_tab_script, args=(tab, label, db_path), default_timeout=3600)
+    at.secrets["INFLUXDB_URL"], at.secrets["INFLUXDB_TOKEN"], at.secrets["INFLUXDB_ORG"] = FAKE_INFLUX
+    at.secrets["PREDICT_API_URL"] = api_url
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return [e.value for e in at.error]
+
+
+def bench_size(kind, rows, repeat, api_url, workdir):
+    schema = get_schema(kind)
+    features = list(schema.features)
+    results = []
+
+    def record(name, runs, n=rows, **extra):
+        results.append({"name": name, "rows": n, "runs": runs, "first": runs[0],
+                        "median": statistics.median(runs), **extra})
+        print(f"  {name:<40} first {runs[0]:9.4f}s  median {statistics.median(runs):9.4f}s")
+
+    frame = generate_traffic(kind, rows)
+    frames = {(schema.bucket, schema.measurement): frame[["timestamp", *features]]}
+    # Tabs and liveapp resolve their client through this process-wide pool
+    core.sources._influx_clients[FAKE_INFLUX] = client = FakeInfluxClient(frames)
+    source = InfluxSource(client, schema)
+
+    # --- InfluxDB (query_influx) ---
+    record("query_influx.window", timed(lambda: source.read("-30d"), repeat)[0])
+    record("query_influx.limit200", timed(lambda: source.read("-30d", limit=200), repeat)[0], n=200)
+    record("query_influx.tail30s", timed(lambda: source.read("-30s"), repeat)[0])
+
+    # --- Scoring (detect_anomalies) ---
+    remote = get_scorer(schema, "remote", api_url, model_version=f"bench-{rows}")
+    runs, _ = timed(lambda: remote.score_frame(frame), 1)
+    warm, _ = timed(lambda: remote.score_frame(frame), repeat)
+    record("detect_anomalies.remote", runs + warm, cache_hit_rate=remote.cache.stats()["hit_rate"])
+    model_path = train_local_model(os.path.join(workdir, f"{kind}_model.joblib"), frame, features)
+    local = LocalScorer(schema, path=model_path)
+    record("detect_anomalies.local", timed(lambda: local.score(frame), repeat)[0])
+    cached_local = CachedScorer(local, PredictionCache(max_entries=max(rows, 1)), "bench")
+    record("detect_anomalies.local_cached", timed(lambda: cached_local.score(frame), repeat)[0])
+
+    # --- Feature stage ---
+    record("features.full", timed(lambda: add_features(frame, features), repeat)[0])
+    pipeline = FeaturePipeline(features)
+    pipeline.transform(frame.iloc[:-FEATURE_TICK_ROWS])
+    warm = pipeline.snapshot()
+    tick = frame.iloc[-FEATURE_TICK_ROWS:]
+    record("features.tick", timed(lambda: (pipeline.restore(warm), pipeline.transform(tick)), repeat)[0],
+           n=len(tick))
+
+    # --- SQLite ---
+    db_path = os.path.join(workdir, f"{kind}_{rows}.db")
+    store = get_store(db_path)
+    record("sqlite.seed", timed(lambda: seed_store(store, kind, frame, features), 1)[0])
+    record("sqlite.update_rollups", timed(lambda: update_rollups(store, kind), 1)[0])
+    tabs.DATABASE_PATH = tabs.live_stream.DATABASE_PATH = db_path
+    record("load_predictions_from_sqlitecloud", timed(lambda: tabs.load_predictions_from_sqlitecloud(kind, "-30d"), repeat)[0])
+    start, end = frame["timestamp"].iloc[0].date(), frame["timestamp"].iloc[-1].date()
+    record("_get_data_by_date_range", timed(lambda: tabs._get_data_by_date_range(kind, start, end), repeat)[0])
+
+    # --- Tab renders ---
+    seed, _ = local.score_frame(frame.tail(LIVE_CAPACITY))
+    LIVE_SEED[schema.label] = seed
+    for tab in TAB_SCRIPTS:
+        runs, errors = timed(lambda: render_tab(tab, schema.label, db_path, api_url), repeat)
+        record(f"render.{tab}", runs, errors=errors)
+    return results
+
+
+def compare(report, baseline, tolerance):
+    """Cases whose median grew by more than `tolerance` (and the noise floor) against the baseline."""
+    before = {(r["name"], r["size"]): r["median"] for r in baseline["results"]}
+    regressions = []
+    for r in report["results"]:
+        old = before.get((r["name"], r["size"]))
+        if old is not None and r["median"] > old * (1 + tolerance) and r["median"] - old > NOISE_FLOOR:
+            regressions.append({"name": r["name"], "size": r["size"], "baseline": old, "median": r["median"]})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time data paths and tab renders on synthetic traffic.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--kind", choices=["dns", "dos"], default="dns")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--out", default="benchmark_report.json")
+    parser.add_argument("--baseline", help="earlier report to compare medians against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing")
+    args = parser.parse_args()
+
+    api_url = start_stub_api()
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "kind": args.kind,
+        "repeat": args.repeat,
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory(prefix="anomaly-bench-") as workdir:
+        for rows in args.sizes:
+            print(f"{args.kind} @ {rows:,} rows")
+            for result in bench_size(args.kind, rows, args.repeat, api_url, workdir):
+                report["results"].append({"size": rows, **result})
+
+    report["telemetry"] = telemetry.snapshot()  # per-operation breakdown behind the timings above
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.out}")
+    for r in report.get("regressions", []):
+        print(f"REGRESSION {r['name']} @ {r['size']:,}: {r['baseline']:.4f}s -> {r['median']:.4f}s")
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
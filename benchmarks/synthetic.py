@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+# --- Synthetic Traffic ---
+# Baseline traffic with attack bursts injected as contiguous runs of rows.
+# The `is_attack` column is the ground truth for the injected bursts.
+
+ROWS_PER_SECOND = 20       # so the live tail window sees the same load at every size
+ATTACK_FRACTION = 0.02
+BURST_ROWS = (50, 500)
+
+
+def _bursts(rows, rng, attack_fraction):
+    is_attack = np.zeros(rows, dtype=bool)
+    target = int(rows * attack_fraction)
+    if target == 0:
+        return is_attack
+    lengths = rng.integers(BURST_ROWS[0], BURST_ROWS[1] + 1, size=max(target // BURST_ROWS[0], 1))
+    lengths = lengths[np.cumsum(lengths) <= target] if lengths[0] <= target else np.array([target])
+    starts = rng.integers(0, max(rows - lengths.max(), 1), size=len(lengths))
+    # Mark [start, start + length) for every burst with one cumulative sum
+    edges = np.zeros(rows + 1, dtype=np.int64)
+    np.add.at(edges, starts, 1)
+    np.add.at(edges, np.minimum(starts + lengths, rows), -1)
+    return np.cumsum(edges[:-1]) > 0
+
+
+def generate_traffic(kind, rows, end=None, rows_per_second=ROWS_PER_SECOND, attack_fraction=ATTACK_FRACTION,
+                     seed=0):
+    """DataFrame of `rows` evenly spaced points ending at `end` (UTC now by default)."""
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp.now(tz="UTC") if end is None else pd.Timestamp(end)
+    step_ns = int(1e9 / rows_per_second)
+    timestamp = pd.to_datetime(end.value - step_ns * np.arange(rows - 1, -1, -1), utc=True)
+    attack = _bursts(rows, rng, attack_fraction)
+
+    if kind == "dns":
+        dns_rate = rng.lognormal(np.log(20), 0.4, rows)
+        dns_rate[attack] *= rng.uniform(8, 15, attack.sum())
+        data = {"dns_rate": dns_rate}
+        rate = dns_rate
+    else:
+        packet_rate = rng.lognormal(np.log(100), 0.3, rows)
+        packet_length = np.clip(rng.normal(500, 150, rows), 40, 1500)
+        packet_rate[attack] *= rng.uniform(15, 30, attack.sum())
+        packet_length[attack] = rng.choice([64.0, 1500.0], attack.sum())
+        data = {"packet_rate": packet_rate, "packet_length": packet_length}
+        rate = packet_rate
+    data["inter_arrival_time"] = rng.exponential(1.0 / rate)
+    return pd.DataFrame({"timestamp": timestamp, **data, "is_attack": attack.astype(float)})
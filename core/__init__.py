@@ -0,0 +1,10 @@
+# --- Core Data Access ---
+# Shared by app.py (tabs), liveapp.py and worker.py: traffic schemas,
+# sources, feature stage, scorers and sinks, plus the building blocks they wrap.
+from core.config import DATABASE_PATH, DEFAULT_API_URL, INGEST_WORKER_NAME, load_config
+from core.schemas import DNS, DOS, SCHEMAS, TrafficSchema, get_schema
+from core.features import FeaturePipeline, add_features
+from core.sources import InfluxSource, get_influx_client
+from core.scoring import CachedScorer, LocalScorer, RemoteScorer, Scorer, get_scorer
+from core.sinks import AlertSink, BackgroundSink, StoreSink, write_all
+from core.store import get_store
@@ -0,0 +1,170 @@
+import queue
+import threading
+import time
+import requests
+from core.inference import get_session
+from core.telemetry import span, telemetry
+
+# --- Alert Dispatcher ---
+# Anomalies are queued without blocking the caller. A background sender
+# coalesces everything of one traffic type seen within COALESCE_WINDOW into a
+# single digest, holds further digests for that type until its cooldown has
+# passed, and backs off when the webhook answers 429.
+
+COALESCE_WINDOW = 10.0   # seconds to gather anomalies into one digest
+DEFAULT_COOLDOWN = 60.0  # minimum seconds between digests of the same type
+MAX_QUEUE = 10_000
+MAX_SEND_ATTEMPTS = 3
+DIGEST_SAMPLES = 5
+
+
+def retry_after_seconds(response, default=1.0):
+    """Seconds to wait from a 429: Discord's JSON `retry_after`, else the Retry-After header."""
+    try:
+        return float(response.json()["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        pass
+    try:
+        return float(response.headers.get("Retry-After", default))
+    except (TypeError, ValueError):
+        return default
+
+
+def format_digest(typ, events):
+    events = sorted(events, key=lambda e: e[1], reverse=True)
+    times = [e[0] for e in events]
+    lines = [
+        f"🚨 **{typ} Anomalies Detected: {len(events)}**",
+        f"**From:** {min(times)}",
+        f"**To:** {max(times)}",
+        f"**Max Score:** {events[0][1]:.4f}",
+    ]
+    lines += [f"• {ts} — {score:.4f}" for ts, score in events[:DIGEST_SAMPLES]]
+    if len(events) > DIGEST_SAMPLES:
+        lines.append(f"…and {len(events) - DIGEST_SAMPLES} more")
+    return {"content": "\n".join(lines)}
+
+
+class AlertDispatcher:
+    def __init__(self, webhook_url, window=COALESCE_WINDOW, cooldowns=None, default_cooldown=DEFAULT_COOLDOWN,
+                 session=None):
+        self.webhook_url = webhook_url
+        self.window = window
+        self.cooldowns = dict(cooldowns or {})
+        self.default_cooldown = default_cooldown
+        self.session = session or get_session()
+        self.stats = {"queued": 0, "dropped": 0, "sent": 0, "failed": 0, "rate_limited": 0}
+        self._stats_lock = threading.Lock()  # producers (any session thread) and the sender all count
+        self._queue = queue.Queue(maxsize=MAX_QUEUE)
+        self._pending = {}    # typ -> [(timestamp, score), ...]
+        self._opened = {}     # typ -> when the current digest started collecting
+        self._last_sent = {}  # typ -> when the last digest went out
+        self._blocked_until = 0.0
+        self._idle = threading.Event()
+        self._idle.set()
+        self._force = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+        self._thread.start()
+
+    # --- Producers ---
+    def submit(self, typ, timestamp, score):
+        try:
+            self._idle.clear()  # before the put, so flush() never sees an idle flag with work queued
+            self._queue.put_nowait((typ, str(timestamp), float(score)))
+            self._count("queued")
+        except queue.Full:
+            self._count("dropped")
+            telemetry.count("alerts.dropped")
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def submit_frame(self, typ, df, time_col="timestamp", score_col="score"):
+        for ts, score in zip(df[time_col].tolist(), df[score_col].tolist()):
+            self.submit(typ, ts, score)
+
+    # --- Sender ---
+    def _cooldown(self, typ):
+        return self.cooldowns.get(typ, self.default_cooldown)
+
+    def _due(self, typ, now):
+        return (now - self._opened[typ] >= self.window
+                and now - self._last_sent.get(typ, float("-inf")) >= self._cooldown(typ)
+                and now >= self._blocked_until)
+
+    def _post(self, message):
+        for _ in range(MAX_SEND_ATTEMPTS):
+            try:
+                response = self.session.post(self.webhook_url, json=message, timeout=10)
+            except requests.RequestException as e:
+                print(f"Discord alert failed: {e}")
+                return False
+            if response.status_code == 429:
+                self._count("rate_limited")
+                telemetry.count("alerts.rate_limited")
+                wait = retry_after_seconds(response)
+                self._blocked_until = time.monotonic() + wait
+                time.sleep(wait)
+                continue
+            if response.ok:
+                return True
+            print(f"Discord alert failed: HTTP {response.status_code}")
+            return False
+        return False
+
+    def _flush_due(self, force=False):
+        now = time.monotonic()
+        for typ in list(self._pending):
+            if force or self._due(typ, now):
+                events = self._pending.pop(typ)
+                del self._opened[typ]
+                self._last_sent[typ] = time.monotonic()
+                with span("alerts.send") as current:
+                    current.rows = len(events)
+                    outcome = "sent" if self._post(format_digest(typ, events)) else "failed"
+                self._count(outcome)
+                telemetry.count(f"alerts.{outcome}")
+
+    def _run(self):
+        while True:
+            try:
+                typ, ts, score = self._queue.get(timeout=0.5)
+                if typ not in self._pending:
+                    self._pending[typ] = []
+                    self._opened[typ] = time.monotonic()
+                self._pending[typ].append((ts, score))
+            except queue.Empty:
+                pass
+            try:
+                if self._force.is_set() and self._queue.empty():
+                    self._flush_due(force=True)
+                    self._force.clear()
+                else:
+                    self._flush_due()
+            except Exception as e:
+                print(f"Alert dispatcher error: {e}")
+            if self._queue.empty() and not self._pending:
+                self._idle.set()
+
+    def flush(self, timeout=None):
+        """Send everything queued so far now, ignoring window and cooldown; True once idle."""
+        if self._idle.is_set():
+            # Nothing to send: a _force left set would push the next alert out uncoalesced
+            return True
+        self._force.set()
+        return self._idle.wait(timeout)
+
+
+_dispatchers = {}
+_dispatchers_lock = threading.Lock()
+
+
+def get_dispatcher(webhook_url, **kwargs):
+    """Process-wide dispatcher per webhook, so cooldowns hold across sessions and tabs."""
+    if not webhook_url:
+        return None
+    with _dispatchers_lock:
+        if webhook_url not in _dispatchers:
+            _dispatchers[webhook_url] = AlertDispatcher(webhook_url, **kwargs)
+        return _dispatchers[webhook_url]
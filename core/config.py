@@ -0,0 +1,27 @@
+import os
+import tomllib
+
+# --- Shared Settings ---
+# Streamlit pages read st.secrets; processes outside Streamlit (worker.py)
+# read the same secrets file, with environment variables taking precedence.
+
+SECRETS_PATH = os.path.join(".streamlit", "secrets.toml")
+DEFAULT_API_URL = "https://violabirech-dos-anomalies-detection.hf.space"
+DEFAULT_MODEL_VERSION = "v1"
+DATABASE_PATH = "data/anomaly_predictions.db"
+INGEST_WORKER_NAME = "ingest"
+CONFIG_KEYS = ("INFLUXDB_URL", "INFLUXDB_ORG", "INFLUXDB_TOKEN", "DISCORD_WEBHOOK", "PREDICT_API_URL",
+               "MODEL_VERSION", "PREDICTION_CACHE_DB", "METRICS_PORT")
+
+
+def load_config(path=SECRETS_PATH):
+    config = {}
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            config.update(tomllib.load(f))
+    for key in CONFIG_KEYS:
+        if os.environ.get(key):
+            config[key] = os.environ[key]
+    config.setdefault("PREDICT_API_URL", DEFAULT_API_URL)
+    config.setdefault("MODEL_VERSION", DEFAULT_MODEL_VERSION)
+    return config
@@ -0,0 +1,90 @@
+import re
+import numpy as np
+import pandas as pd
+
+# --- Chart Resolution ---
+# Charts never need more points than the pixels they are drawn on, so both the
+# query window and the client-side downsampler are sized from the chart width.
+
+CHART_WIDTH_PX = 1200
+NICE_WINDOWS = [1, 5, 10, 15, 30, 60, 120, 300, 600, 900, 1800, 3600, 7200, 10800, 21600, 43200, 86400]
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def range_seconds(start_range):
+    """Length in seconds of a relative Flux range such as '-30m' or '-7d'."""
+    match = re.fullmatch(r"-?(\d+)([smhdw])", start_range.strip())
+    if not match:
+        raise ValueError(f"Unsupported time range: {start_range}")
+    return int(match.group(1)) * _UNITS[match.group(2)]
+
+
+def pick_window_seconds(span_seconds, width_px=CHART_WIDTH_PX):
+    """Smallest 'nice' bucket size that keeps the chart at or under one point per pixel."""
+    target = span_seconds / max(width_px, 1)
+    for window in NICE_WINDOWS:
+        if window >= target:
+            return window
+    return NICE_WINDOWS[-1]
+
+
+def flux_duration(seconds):
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds % size == 0:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
+
+
+# --- Largest-Triangle-Three-Buckets ---
+def lttb_indices(x, y, n_out):
+    """Indices of the points LTTB keeps; always includes the first and last point."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[stop:next_stop].mean()
+        next_y = y[stop:next_stop].mean()
+        bx, by = x[start:stop], y[start:stop]
+        area = np.abs((x[prev] - next_x) * (by - y[prev]) - (x[prev] - bx) * (next_y - y[prev]))
+        prev = start + int(np.argmax(area))
+        keep[i + 1] = prev
+    return keep
+
+
+def lttb_frame(df, x, y, n_out=CHART_WIDTH_PX, by=None):
+    """Downsample df for a line chart of y over x; `by` downsamples each colour group separately."""
+    if df.empty or len(df) <= n_out:
+        return df
+    if by is not None:
+        groups = [g for _, g in df.groupby(by, sort=False)]
+        share = max(n_out // max(len(groups), 1), 3)
+        return pd.concat([lttb_frame(g, x, y, share) for g in groups]).sort_values(x)
+    xs = df[x]
+    if pd.api.types.is_datetime64_any_dtype(xs):
+        xs = xs.astype("int64")
+    ys = df[y].fillna(0.0)
+    return df.iloc[lttb_indices(xs.to_numpy(), ys.to_numpy(), n_out)]
+
+
+# --- Score Aggregation ---
+def aggregate_scores(df, window_seconds, time_col="timestamp", score_col="score", anomaly_col="anomaly"):
+    """Mean/max score, anomaly count and row count per time bucket."""
+    if df.empty:
+        return pd.DataFrame(columns=[time_col, "mean_score", "max_score", "anomalies", "count"])
+    grouped = df.set_index(time_col).resample(f"{int(window_seconds)}s")
+    out = pd.DataFrame({
+        "mean_score": grouped[score_col].mean(),
+        "max_score": grouped[score_col].max(),
+        "anomalies": grouped[anomaly_col].sum(),
+        "count": grouped[score_col].count(),
+    })
+    return out[out["count"] > 0].reset_index()
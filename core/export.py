@@ -0,0 +1,78 @@
+import os
+import tempfile
+import threading
+
+# --- On-demand Exports ---
+# Files are built only when asked for, by streaming the range out of the
+# prediction store chunk by chunk into a temp file. Built files are reused
+# until rows in the range are added, purged or re-scored (store.range_version).
+
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "anomaly_exports")
+EXPORT_CHUNK_ROWS = 50_000
+MAX_EXPORTS = 8
+PARQUET_COMPRESSION = "zstd"
+EXPORT_FORMATS = {"CSV": ("csv", "text/csv"), "Parquet": ("parquet", "application/vnd.apache.parquet")}
+
+_exports = {}  # (kind, start, end, format) -> (range version, path)
+_exports_lock = threading.Lock()
+
+
+def _arrow_schema(store, kind):
+    # Fixed from the table definition, so chunks whose optional columns are all NULL still match.
+    # pyarrow is only imported once someone asks for a Parquet file.
+    import pyarrow as pa
+
+    arrow_types = {"INTEGER": pa.int64(), "REAL": pa.float64()}
+    return pa.schema([
+        (name, pa.timestamp("ns") if name == "timestamp" else arrow_types.get(decl, pa.string()))
+        for name, decl in store.column_types(kind).items()
+    ])
+
+
+def _write_csv(chunks, path):
+    with open(path, "w", newline="") as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, header=i == 0, index=False)
+
+
+def _write_parquet(chunks, path, schema):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with pq.ParquetWriter(path, schema, compression=PARQUET_COMPRESSION) as writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def _evict(keep):
+    # Oldest builds go first once there are more than MAX_EXPORTS
+    while len(_exports) > MAX_EXPORTS:
+        key = next(k for k in _exports if k != keep)
+        _, path = _exports.pop(key)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def export_range(store, kind, start, end, fmt="CSV"):
+    """Path of a file holding every stored row of `kind` in [start, end], building it if needed."""
+    extension, _ = EXPORT_FORMATS[fmt]
+    key = (kind, str(start), str(end), fmt)
+    version = store.range_version(kind, start, end)
+    with _exports_lock:
+        cached = _exports.get(key)
+        if cached is not None and cached[0] == version and os.path.exists(cached[1]):
+            return cached[1]
+
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        path = os.path.join(EXPORT_DIR, f"{kind}_{start}_{end}.{extension}")
+        partial = f"{path}.partial"
+        chunks = store.iter_range(kind, start, end, chunk_rows=EXPORT_CHUNK_ROWS)
+        if fmt == "Parquet":
+            _write_parquet(chunks, partial, _arrow_schema(store, kind))
+        else:
+            _write_csv(chunks, partial)
+        os.replace(partial, path)  # readers never see a half-written file
+        _exports.pop(key, None)
+        _exports[key] = (version, path)
+        _evict(keep=key)
+        return path
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+# --- Feature Engineering ---
+# Derived columns computed between ingestion and scoring, per schema feature:
+# trailing mean/std over the last N points, rate of change per second, and an
+# EWMA baseline. Everything is vectorized over the frame. A FeaturePipeline
+# carries the few values each feature needs from earlier rows (the window
+# tail, last value and time, last EWMA), so feeding a stream tick by tick
+# gives exactly the same columns as one pass over the whole stream.
+# Local models pick the derived columns up through their bundle's "features";
+# the remote API still receives the raw schema features only.
+
+ROLLING_WINDOWS = (10, 60)  # trailing points
+EWMA_SPAN = 30              # points
+
+
+def derived_columns(features, windows=ROLLING_WINDOWS):
+    columns = []
+    for f in features:
+        for n in windows:
+            columns += [f"{f}_mean_{n}", f"{f}_std_{n}"]
+        columns += [f"{f}_roc", f"{f}_ewma"]
+    return columns
+
+
+def _rolling(values, history, window):
+    """Mean and population std of each value's trailing `window` points, history included.
+
+    Sums are accumulated one window slot at a time, oldest first, into per-row totals:
+    every row adds the same values in the same order wherever a tick started, and the
+    scratch space is a few row-length arrays rather than rows x window. (A cumsum
+    difference would also be O(rows), but its rounding depends on every earlier row of
+    the frame, so ticks would drift from one pass.) Only the first rows of a stream see
+    a partial window.
+    """
+    history = history[len(history) - min(len(history), window - 1):]
+    missing = window - 1 - len(history)  # window slots before the stream started
+    padded = np.concatenate([np.zeros(missing), history, values])
+    n = len(values)
+    count = np.minimum(np.arange(1, n + 1) + len(history), window)
+    total = np.zeros(n)
+    for k in range(window):
+        first = max(missing - k, 0)  # rows whose k-th slot is real
+        total[first:] += padded[k + first:k + n]
+    mean = total / count
+    squares = np.zeros(n)
+    for k in range(window):
+        first = max(missing - k, 0)
+        deviation = padded[k + first:k + n] - mean[first:]
+        deviation *= deviation
+        squares[first:] += deviation
+    return mean, np.sqrt(squares / count)
+
+
+def _copy_state(state):
+    # Arrays are replaced, never written in place, so copying the dicts is enough
+    return {"time": state["time"], **{k: dict(state[k]) for k in ("history", "last", "ewma")}}
+
+
+class FeaturePipeline:
+    def __init__(self, features, windows=ROLLING_WINDOWS, ewma_span=EWMA_SPAN):
+        self.features = list(features)
+        self.windows = tuple(windows)
+        self.ewma_span = ewma_span
+        self.columns = derived_columns(self.features, self.windows)
+        self.reset()
+
+    def reset(self):
+        self.state = {"time": None, "history": {}, "last": {}, "ewma": {}}
+
+    def snapshot(self):
+        """Copy of the carried state, for restore() when a tick is rolled back."""
+        return _copy_state(self.state)
+
+    def restore(self, snapshot):
+        self.state = _copy_state(snapshot)
+
+    @property
+    def warmup_rows(self):
+        """Rows of history that reproduce the rolling columns exactly (EWMA to within ~1e-4)."""
+        return max(max(self.windows) - 1, 10 * self.ewma_span)
+
+    def transform(self, df):
+        """df plus the derived columns; rows must be time-ordered and newer than the last tick."""
+        if df.empty:
+            return df.assign(**{c: pd.Series(dtype=float) for c in self.columns})
+        state = self.state
+        times = pd.DatetimeIndex(df["timestamp"]).as_unit("ns").asi8
+        previous_times = np.concatenate([[times[0] if state["time"] is None else state["time"]], times[:-1]])
+        dt = (times - previous_times) / 1e9
+        derived = {}
+        for f in self.features:
+            # Gaps carry the last observation forward (0 before the first one)
+            values = df[f].astype(float).to_numpy()
+            if np.isnan(values).any():
+                carried = np.concatenate([[state["last"].get(f, np.nan)], values])
+                values = pd.Series(carried).ffill().fillna(0.0).to_numpy()[1:]
+            history = state["history"].get(f, np.zeros(0))
+            for n in self.windows:
+                derived[f"{f}_mean_{n}"], derived[f"{f}_std_{n}"] = _rolling(values, history, n)
+
+            previous = np.concatenate([[state["last"].get(f, values[0])], values[:-1]])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                derived[f"{f}_roc"] = np.where(dt > 0, (values - previous) / dt, 0.0)
+
+            # adjust=False is the plain recursion e_t = (1 - a) e_(t-1) + a x_t; seeding it with
+            # the last EWMA continues the same recursion across ticks
+            seed = [state["ewma"][f]] if f in state["ewma"] else []
+            ewma = pd.Series(np.concatenate([seed, values])).ewm(span=self.ewma_span, adjust=False).mean()
+            derived[f"{f}_ewma"] = ewma.to_numpy()[len(seed):]
+
+            keep = max(self.windows) - 1
+            state["history"][f] = np.concatenate([history, values])[-keep:] if keep else np.zeros(0)
+            state["last"][f] = values[-1]
+            state["ewma"][f] = derived[f"{f}_ewma"][-1]
+        state["time"] = times[-1]
+        return df.assign(**{c: derived[c] for c in self.columns})
+
+
+def add_features(df, features, windows=ROLLING_WINDOWS, ewma_span=EWMA_SPAN):
+    """One-off full recompute over a time-ordered frame."""
+    return FeaturePipeline(features, windows, ewma_span).transform(df)
@@ -0,0 +1,110 @@
+import threading
+import time
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# --- Batch Inference Client ---
+# Contract: POST {endpoint}/batch with {"columns": {feature: [values, ...]}}
+# returns {"anomaly": [...], "anomaly_score" | "reconstruction_error": [...]}
+# with one entry per input row, in order.
+
+BATCH_SIZE = 500
+REQUEST_TIMEOUT = (3.05, 30)  # (connect, read) seconds
+SESSION_RETRIES = 2  # urllib3 retries on connection errors and 502/503/504
+SCORE_KEYS = ("anomaly_score", "reconstruction_error", "score")
+
+_sessions = {}  # retries -> session
+_session_lock = threading.Lock()
+_unbatched_endpoints = set()
+
+
+def get_session(retries=True):
+    """Process-wide keep-alive session shared by every rerun and tab.
+
+    retries=False is for calls under a deadline: a retry would restart the
+    per-request timeout after the budget is already spent.
+    """
+    with _session_lock:
+        if retries not in _sessions:
+            retry = Retry(total=SESSION_RETRIES if retries else 0, backoff_factor=0.3,
+                          status_forcelist=(502, 503, 504), allowed_methods=frozenset({"POST"}))
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[retries] = session
+    return _sessions[retries]
+
+
+def batch_endpoint(endpoint):
+    return endpoint.rstrip("/") + "/batch"
+
+
+def supports_batch(endpoint):
+    """False once the endpoint has answered 404/405 on its batch route."""
+    return endpoint not in _unbatched_endpoints
+
+
+def extract_score(result, default=0.0):
+    for key in SCORE_KEYS:
+        if key in result:
+            return result[key]
+    return default
+
+
+def _chunk_timeout(timeout, deadline):
+    # No chunk may wait past the deadline
+    if deadline is None:
+        return timeout
+    remaining = deadline - time.monotonic()
+    return tuple(min(t, remaining) for t in timeout)
+
+
+def predict_batch(endpoint, df, features, batch_size=BATCH_SIZE, timeout=REQUEST_TIMEOUT, budget=None):
+    """Score `df[features]` in chunks, within `budget` seconds overall when given.
+
+    Returns (anomaly, score, ok) NumPy arrays aligned with df; rows whose chunk
+    failed or was not reached before the deadline keep anomaly=0/score=0 and ok=False.
+    Servers without the batch route get the remaining rows through the concurrent
+    per-row path (core.pipeline.predict_rows) under the same deadline.
+    """
+    n = len(df)
+    anomaly = np.zeros(n, dtype=np.int8)
+    score = np.zeros(n, dtype=float)
+    ok = np.zeros(n, dtype=bool)
+    if n == 0:
+        return anomaly, score, ok
+
+    session = get_session(retries=budget is None)
+    deadline = time.monotonic() + budget if budget is not None else None
+    values = {f: df[f].to_numpy() for f in features}
+    for start in range(0, n, batch_size):
+        if deadline is not None and time.monotonic() >= deadline:
+            print(f"Batch inference budget exhausted; {n - start} rows unscored")
+            break
+        stop = min(start + batch_size, n)
+        columns = {f: values[f][start:stop].tolist() for f in features}
+        try:
+            if endpoint not in _unbatched_endpoints:
+                response = session.post(batch_endpoint(endpoint), json={"columns": columns},
+                                        timeout=_chunk_timeout(timeout, deadline))
+                if response.status_code in (404, 405):
+                    _unbatched_endpoints.add(endpoint)
+            if endpoint in _unbatched_endpoints:
+                from core.pipeline import predict_rows  # deferred: core.pipeline imports this module
+
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                anomaly[start:], score[start:], ok[start:] = predict_rows(endpoint, df.iloc[start:], features,
+                                                                          budget=remaining)
+                break
+            response.raise_for_status()
+            result = response.json()
+            anomaly[start:stop] = np.asarray(result["anomaly"], dtype=np.int8)
+            score[start:stop] = np.asarray(extract_score(result, [0.0] * (stop - start)), dtype=float)
+            ok[start:stop] = True
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print(f"Batch inference error ({start}:{stop}): {e}")
+    return anomaly, score, ok
+
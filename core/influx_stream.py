@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+# --- Streaming Reads ---
+# Pulls pivoted Flux results through the CSV iterator and parses them one
+# chunk at a time, so a 30-day window never materializes as one list of
+# FluxRecords or one pandas frame unless the caller asks for it.
+
+CHUNK_ROWS = 10_000
+NON_TAG_COLUMNS = {"", "result", "table", "_start", "_stop", "_time", "_measurement"}
+
+
+def csv_dialect():
+    from influxdb_client import Dialect  # deferred: influxdb_client costs ~0.35s to import
+
+    return Dialect(header=True, delimiter=",", comment_prefix="#", annotations=[], date_time_format="RFC3339Nano")
+
+
+def build_flux_query(bucket, measurement, fields, start_range, limit=None):
+    query = f'''from(bucket: "{bucket}")
+    |> range(start: {start_range})
+    |> filter(fn: (r) => r._measurement == "{measurement}")
+    |> filter(fn: (r) => { ' or '.join([f'r._field == "{f}"' for f in fields]) })
+    |> pivot(rowKey:["_time"], columnKey:["_field"], valueColumn:"_value")
+    |> group()
+    |> sort(columns: ["_time"], desc: false)'''
+    if limit is not None:
+        query += f"\n    |> limit(n:{limit})"
+    return query
+
+
+def build_aggregated_query(bucket, measurement, fields, start_range, window, fn="mean"):
+    """Like build_flux_query, one row per `window` (a Flux duration such as "30s")."""
+    return f'''from(bucket: "{bucket}")
+    |> range(start: {start_range})
+    |> filter(fn: (r) => r._measurement == "{measurement}")
+    |> filter(fn: (r) => { ' or '.join([f'r._field == "{f}"' for f in fields]) })
+    |> aggregateWindow(every: {window}, fn: {fn}, createEmpty: false)
+    |> pivot(rowKey:["_time"], columnKey:["_field"], valueColumn:"_value")
+    |> group()
+    |> sort(columns: ["_time"], desc: false)'''
+
+
+def _to_frame(times, values, series=None):
+    data = {"timestamp": pd.to_datetime(times, utc=True, format="ISO8601")}
+    for field, raw in values.items():
+        data[field] = pd.to_numeric(pd.Series(raw, dtype=object), errors="coerce").to_numpy(dtype=float)
+    if series is not None:
+        data["series"] = series
+    return pd.DataFrame(data)
+
+
+def iter_influx_chunks(query_api, query, fields, chunk_rows=CHUNK_ROWS, tags=False):
+    """Yield DataFrames of at most `chunk_rows` rows (timestamp + float fields).
+
+    With tags=True each row also carries `series`, its tag values as "tag=value,...",
+    so points of different series at the same time stay distinguishable.
+    """
+    columns = None
+    tag_columns = []
+    times, series = [], []
+    values = {f: [] for f in fields}
+    for row in query_api.query_csv(query, dialect=csv_dialect()):
+        if len(row) < 2:
+            continue  # blank line between tables
+        if "_time" in row:
+            columns = {name: i for i, name in enumerate(row)}
+            tag_columns = [(name, i) for name, i in columns.items() if name not in NON_TAG_COLUMNS and name not in fields]
+            continue
+        times.append(row[columns["_time"]])
+        for f in fields:
+            idx = columns.get(f)
+            values[f].append(row[idx] if idx is not None else "")
+        if tags:
+            series.append(",".join(f"{name}={row[i]}" for name, i in tag_columns))
+        if len(times) >= chunk_rows:
+            yield _to_frame(times, values, series if tags else None)
+            times, series = [], []
+            values = {f: [] for f in fields}
+    if times:
+        yield _to_frame(times, values, series if tags else None)
+
+
+class ColumnBuilder:
+    """Typed NumPy columns grown geometrically as chunks arrive."""
+
+    def __init__(self, fields, capacity=CHUNK_ROWS):
+        self.fields = list(fields)
+        self.size = 0
+        self._times = np.empty(capacity, dtype="datetime64[ns]")
+        self._values = {f: np.empty(capacity, dtype=float) for f in self.fields}
+
+    def _reserve(self, n):
+        capacity = len(self._times)
+        if self.size + n <= capacity:
+            return
+        while capacity < self.size + n:
+            capacity *= 2
+        self._times = np.resize(self._times, capacity)
+        self._values = {f: np.resize(v, capacity) for f, v in self._values.items()}
+
+    def append(self, chunk):
+        n = len(chunk)
+        self._reserve(n)
+        stop = self.size + n
+        self._times[self.size:stop] = chunk["timestamp"].dt.tz_convert("UTC").dt.tz_localize(None).to_numpy(dtype="datetime64[ns]")
+        for f in self.fields:
+            self._values[f][self.size:stop] = chunk[f].to_numpy(dtype=float)
+        self.size = stop
+
+    def to_frame(self):
+        data = {"timestamp": pd.DatetimeIndex(self._times[:self.size]).tz_localize("UTC")}
+        for f in self.fields:
+            data[f] = self._values[f][:self.size]
+        return pd.DataFrame(data)
+
+
+def read_influx_frame(query_api, query, fields, chunk_rows=CHUNK_ROWS):
+    builder = ColumnBuilder(fields, capacity=chunk_rows)
+    for chunk in iter_influx_chunks(query_api, query, fields, chunk_rows):
+        builder.append(chunk)
+    return builder.to_frame()
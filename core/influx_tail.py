@@ -0,0 +1,54 @@
+import pandas as pd
+
+# --- Incremental Tail-Follow Reader ---
+# Remembers the newest `_time` returned for one bucket/measurement and asks
+# InfluxDB only for points at or after it on the next tick. Rows at or before
+# the cursor are dropped, so overlapping or late refreshes never re-score.
+# A fetch read in several chunks filters every chunk against the cursor as it
+# stood before the fetch (`since`), and the cursor ends at the newest point of
+# the whole batch, so chunks need not arrive in time order.
+
+_CURSOR = object()  # advance() default: filter against the cursor's own position
+
+
+def to_flux_time(ts):
+    ts = pd.Timestamp(ts)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return ts.isoformat().replace("+00:00", "Z")
+
+
+class TailCursor:
+    def __init__(self, initial_range="-30s", time_column="timestamp", key_columns=("series",)):
+        self.initial_range = initial_range
+        self.time_column = time_column
+        self.key_columns = tuple(key_columns)  # with the time, what identifies one point
+        self.last_time = None
+        self.rows_seen = 0
+
+    def start_range(self):
+        """Flux `range(start: ...)` argument for the next fetch."""
+        if self.last_time is None:
+            return self.initial_range
+        # range() is inclusive; the boundary row is filtered out in advance().
+        return to_flux_time(self.last_time)
+
+    def advance(self, df, since=_CURSOR):
+        """Return only rows newer than `since` (default: the cursor) and move the cursor past them."""
+        if df.empty or self.time_column not in df.columns:
+            return df.iloc[0:0]
+        since = self.last_time if since is _CURSOR else since
+        times = pd.to_datetime(df[self.time_column], utc=True)
+        mask = (times > since if since is not None else pd.Series(True, index=df.index)).to_numpy()
+        # Different series may share a timestamp; only repeats of the same point are dropped.
+        # Frames without series columns fall back to exact duplicate rows.
+        keys = [c for c in self.key_columns if c in df.columns]
+        new_rows = df[mask].drop_duplicates(subset=[self.time_column, *keys] if keys else None, keep="last")
+        if not new_rows.empty:
+            newest = times[mask].max()
+            self.last_time = newest if self.last_time is None else max(self.last_time, newest)
+            self.rows_seen += len(new_rows)
+        return new_rows
+
+    def reset(self):
+        self.last_time = None
+        self.rows_seen = 0
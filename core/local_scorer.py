@@ -0,0 +1,52 @@
+import os
+import numpy as np
+
+# --- Local Scoring Backend ---
+# In-process alternative to the HF Space: the DNS/DoS models are loaded once
+# per process and whole frames are scored in a single vectorized call.
+# A model file is either a fitted estimator/pipeline or a dict bundle
+# {"model": estimator, "features": [...], "threshold": float}.
+# joblib/scikit-learn are imported on first use: ~1s that the remote backend never needs.
+
+MODEL_DIR = os.environ.get("MODEL_DIR", "models")
+MODEL_PATHS = {
+    "dns": os.path.join(MODEL_DIR, "dns_model.joblib"),
+    "dos": os.path.join(MODEL_DIR, "dos_model.joblib"),
+}
+
+
+def load_model(path):
+    import joblib
+
+    bundle = joblib.load(path)
+    if not isinstance(bundle, dict):
+        bundle = {"model": bundle}
+    bundle.setdefault("features", None)
+    bundle.setdefault("threshold", None)
+    return bundle
+
+
+def score_frame_local(bundle, df, features):
+    """Return (anomaly, score, ok) arrays aligned with df, matching core.inference.predict_batch."""
+    n = len(df)
+    if n == 0:
+        return np.zeros(0, dtype=np.int8), np.zeros(0, dtype=float), np.zeros(0, dtype=bool)
+    from sklearn.base import is_outlier_detector
+
+    model = bundle["model"]
+    X = df[bundle["features"] or features].to_numpy(dtype=float)
+
+    if is_outlier_detector(model):
+        # Outlier detectors: lower score_samples = more abnormal, predict() == -1 flags an outlier.
+        score = -model.score_samples(X) if hasattr(model, "score_samples") else -model.decision_function(X)
+        anomaly = model.predict(X) == -1
+    elif hasattr(model, "predict_proba"):
+        score = model.predict_proba(X)[:, 1]
+        anomaly = model.predict(X) == 1
+    else:
+        score = np.asarray(model.predict(X), dtype=float)
+        anomaly = score > 0.5
+    if bundle["threshold"] is not None:
+        anomaly = score > bundle["threshold"]
+    return anomaly.astype(np.int8), np.asarray(score, dtype=float), np.ones(n, dtype=bool)
+
@@ -0,0 +1,115 @@
+import asyncio
+import queue
+import random
+import threading
+import httpx
+import numpy as np
+from core.inference import extract_score
+
+# --- Prediction Pipeline Settings ---
+MAX_CONCURRENCY = 8
+REQUEST_TIMEOUT = 5.0      # seconds per attempt
+MAX_RETRIES = 2
+BACKOFF_BASE = 0.25        # seconds, doubled per attempt with jitter
+LATENCY_BUDGET = 8.0       # whole refresh must finish inside the 10s autorefresh
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class PredictionError(Exception):
+    pass
+
+
+async def _predict_one(client, semaphore, api_url, payload, deadline):
+    loop = asyncio.get_running_loop()
+    for attempt in range(MAX_RETRIES + 1):
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise PredictionError("latency budget exhausted")
+        try:
+            async with semaphore:
+                response = await client.post(api_url, json=payload, timeout=min(REQUEST_TIMEOUT, remaining))
+            if response.status_code not in RETRY_STATUS:
+                response.raise_for_status()
+                return response.json()
+            error = PredictionError(f"HTTP {response.status_code}")
+        except httpx.TransportError as e:
+            error = e
+        if attempt == MAX_RETRIES:
+            raise error
+        backoff = BACKOFF_BASE * (2 ** attempt) * (1 + random.random())
+        await asyncio.sleep(min(backoff, max(deadline - loop.time(), 0)))
+
+
+async def _predict_all(payloads, api_url, budget):
+    # One outcome per payload, in order: the JSON result or the exception that ended it.
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + (budget if budget is not None else float("inf"))
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    limits = httpx.Limits(max_connections=MAX_CONCURRENCY, max_keepalive_connections=MAX_CONCURRENCY)
+    async with httpx.AsyncClient(limits=limits) as client:
+        tasks = [asyncio.create_task(_predict_one(client, semaphore, api_url, payload, deadline))
+                 for payload in payloads]
+        done, pending = await asyncio.wait(tasks, timeout=budget) if tasks else (set(), set())
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    outcomes = []
+    for task in tasks:
+        if task.cancelled():
+            outcomes.append(PredictionError("timed out"))
+        else:
+            outcomes.append(task.exception() or task.result())
+    return outcomes
+
+
+def predict_rows(api_url, df, features, budget=LATENCY_BUDGET):
+    """Per-row endpoint scored concurrently; (anomaly, score, ok) arrays aligned with df like predict_batch."""
+    n = len(df)
+    anomaly = np.zeros(n, dtype=np.int8)
+    score = np.zeros(n, dtype=float)
+    ok = np.zeros(n, dtype=bool)
+    if n == 0:
+        return anomaly, score, ok
+    payloads = df[list(features)].to_dict("records")
+    for i, outcome in enumerate(asyncio.run(_predict_all(payloads, api_url, budget))):
+        if isinstance(outcome, Exception) or "anomaly" not in outcome:
+            continue
+        anomaly[i] = outcome["anomaly"]
+        score[i] = extract_score(outcome)
+        ok[i] = True
+    return anomaly, score, ok
+
+
+# --- Fire-and-forget Stages ---
+class BackgroundStage:
+    """Single daemon thread draining a bounded queue so slow sinks never block a rerun."""
+
+    def __init__(self, name, maxsize=1000):
+        self.name = name
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _run(self):
+        while True:
+            fn, args = self._queue.get()
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"{self.name} stage error: {e}")
+            finally:
+                self._queue.task_done()
+
+    def submit(self, fn, *args):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait((fn, args))
+        except queue.Full:
+            print(f"{self.name} stage full, dropping job")
+
+
+log_stage = BackgroundStage("sqlite-log")
@@ -0,0 +1,168 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from core.telemetry import telemetry
+
+# --- Prediction Cache ---
+# Entries are keyed by (namespace, feature hash) where the namespace is
+# "endpoint|traffic type|model version", so a model bump never serves stale scores.
+
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_TTL = 6 * 3600  # seconds
+SQLITE_CHUNK = 500      # stay well below SQLite's bound-parameter limit
+PURGE_INTERVAL = 300
+
+
+def make_namespace(endpoint, traffic_type, model_version):
+    return f"{endpoint}|{traffic_type}|{model_version}"
+
+
+def hash_features(df, features):
+    """Vectorized 64-bit hash of each row's feature vector."""
+    return pd.util.hash_pandas_object(df[features], index=False).to_numpy(dtype=np.uint64)
+
+
+class PredictionCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, db_path=None, ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._last_purge = 0.0
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS prediction_cache (
+                    namespace TEXT NOT NULL,
+                    feature_hash INTEGER NOT NULL,
+                    anomaly INTEGER NOT NULL,
+                    score REAL NOT NULL,
+                    created REAL NOT NULL,
+                    PRIMARY KEY (namespace, feature_hash)
+                ) WITHOUT ROWID
+            """)
+            self._db.commit()
+
+    # --- Lookup ---
+    def get_many(self, namespace, hashes):
+        """Return (anomaly, score, found) arrays aligned with `hashes`."""
+        n = len(hashes)
+        anomaly = np.zeros(n, dtype=np.int8)
+        score = np.zeros(n, dtype=float)
+        found = np.zeros(n, dtype=bool)
+        expiry = time.time() - self.ttl
+        with self._lock:
+            for i, h in enumerate(hashes.tolist()):
+                entry = self._lru.get((namespace, h))
+                if entry is not None and entry[2] >= expiry:
+                    self._lru.move_to_end((namespace, h))
+                    anomaly[i], score[i], _ = entry
+                    found[i] = True
+            if self._db is not None and not found.all():
+                self._lookup_disk(namespace, hashes, anomaly, score, found, expiry)
+            hit_count = int(found.sum())
+            self.hits += hit_count
+            self.misses += n - hit_count
+        telemetry.count("prediction_cache.hits", hit_count)
+        telemetry.count("prediction_cache.misses", n - hit_count)
+        return anomaly, score, found
+
+    def _lookup_disk(self, namespace, hashes, anomaly, score, found, expiry):
+        missing = np.flatnonzero(~found)
+        positions = {}
+        for i in missing.tolist():
+            positions.setdefault(int(hashes[i].astype(np.int64)), []).append(i)
+        keys = list(positions)
+        for start in range(0, len(keys), SQLITE_CHUNK):
+            chunk = keys[start:start + SQLITE_CHUNK]
+            rows = self._db.execute(
+                f"SELECT feature_hash, anomaly, score, created FROM prediction_cache "
+                f"WHERE namespace = ? AND created >= ? AND feature_hash IN ({','.join('?' * len(chunk))})",
+                (namespace, expiry, *chunk),
+            ).fetchall()
+            for signed_hash, a, s, created in rows:
+                for i in positions[signed_hash]:
+                    anomaly[i], score[i], found[i] = a, s, True
+                    self.disk_hits += 1
+                self._remember(namespace, int(np.int64(signed_hash).astype(np.uint64)), a, s, created)
+
+    # --- Insert ---
+    def put_many(self, namespace, hashes, anomaly, score):
+        now = time.time()
+        with self._lock:
+            for h, a, s in zip(hashes.tolist(), anomaly.tolist(), score.tolist()):
+                self._remember(namespace, h, a, s, now)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO prediction_cache VALUES (?, ?, ?, ?, ?)",
+                    [(namespace, int(h), a, s, now)
+                     for h, a, s in zip(hashes.astype(np.int64).tolist(), anomaly.tolist(), score.tolist())],
+                )
+                self._db.commit()
+                if now - self._last_purge > PURGE_INTERVAL:
+                    self._db.execute("DELETE FROM prediction_cache WHERE created < ?", (now - self.ttl,))
+                    self._db.commit()
+                    self._last_purge = now
+
+    def _remember(self, namespace, h, a, s, created):
+        self._lru[(namespace, h)] = (a, s, created)
+        self._lru.move_to_end((namespace, h))
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._lru),
+        }
+
+
+def score_cached(cache, namespace, df, features, score_fn):
+    """(anomaly, score, ok) arrays aligned with df, calling `score_fn` only for unseen feature vectors.
+
+    `score_fn(frame)` returns (anomaly, score) or (anomaly, score, ok); rows with
+    ok=False are returned but not cached.
+    """
+    if df.empty:
+        return np.zeros(0, dtype=np.int8), np.zeros(0, dtype=float), np.zeros(0, dtype=bool)
+
+    hashes = hash_features(df, features)
+    anomaly, score, found = cache.get_many(namespace, hashes)
+    ok = found.copy()
+    if not found.all():
+        # Identical vectors inside one window are scored once.
+        miss_hashes, first_idx, inverse = np.unique(hashes[~found], return_index=True, return_inverse=True)
+        misses = df.iloc[np.flatnonzero(~found)[first_idx]]
+        scored = score_fn(misses)
+        new_anomaly = np.asarray(scored[0], dtype=np.int8)
+        new_score = np.asarray(scored[1], dtype=float)
+        new_ok = np.asarray(scored[2], dtype=bool) if len(scored) > 2 else np.ones(len(misses), dtype=bool)
+        anomaly[~found] = new_anomaly[inverse]
+        score[~found] = new_score[inverse]
+        ok[~found] = new_ok[inverse]
+        cache.put_many(namespace, miss_hashes[new_ok], new_anomaly[new_ok], new_score[new_ok])
+    return anomaly, score, ok
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(db_path=None):
+    """Process-wide cache per backing file, shared by the apps, tabs and the worker."""
+    with _caches_lock:
+        if db_path not in _caches:
+            _caches[db_path] = PredictionCache(db_path=db_path)
+        return _caches[db_path]
@@ -0,0 +1,216 @@
+import calendar
+import threading
+import time
+from datetime import timedelta
+import pandas as pd
+from core.store import TABLES, ROLLUP_RESOLUTIONS, format_timestamp, to_utc_naive, utc_now
+
+# --- Retention & Rollups ---
+# Raw predictions are kept for RAW_TTL_DAYS; minute/hour rollups
+# (count, anomaly count, score min/sum/max) are maintained incrementally
+# from an id watermark, so late rows are folded in and nothing is rescanned.
+
+RAW_TTL_DAYS = 30
+ROLLUP_TTL_DAYS = {"minute": 7, "hour": 400}
+ROLLUP_INTERVAL = 15  # seconds between background passes
+MINUTE_ROLLUP_MAX_SPAN = 24 * 3600  # longer windows read the hour rollup
+
+
+def _epoch(value):
+    # Naive timestamps are stored as text and SQLite's strftime('%s') treats them as UTC.
+    return calendar.timegm(to_utc_naive(value).timetuple())
+
+
+def update_rollups(store, kind):
+    """Fold raw rows inserted since the last pass into the minute and hour rollups."""
+    table = TABLES[kind]
+    conn = store.connection()
+    with conn:
+        # Take the write lock before reading the watermark: worker.py and the app both run
+        # rollup passes, and two passes folding the same id range would double the counts.
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT last_id FROM rollup_state WHERE name = ?", (table,)).fetchone()
+        last_id = row[0] if row else 0
+        max_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+        if max_id <= last_id:
+            return 0
+        for resolution, seconds in ROLLUP_RESOLUTIONS.items():
+            conn.execute(f"""
+                INSERT INTO {table}_rollup_{resolution} (bucket, count, anomalies, score_min, score_sum, score_max)
+                SELECT CAST(strftime('%s', timestamp) AS INTEGER) / {seconds} * {seconds} AS bucket,
+                       COUNT(*), COALESCE(SUM(is_anomaly), 0),
+                       MIN(anomaly_score), SUM(anomaly_score), MAX(anomaly_score)
+                FROM {table}
+                WHERE id > ? AND id <= ?
+                GROUP BY bucket
+                ON CONFLICT(bucket) DO UPDATE SET
+                    count = count + excluded.count,
+                    anomalies = anomalies + excluded.anomalies,
+                    score_min = MIN(COALESCE(score_min, excluded.score_min), COALESCE(excluded.score_min, score_min)),
+                    score_sum = COALESCE(score_sum, 0) + COALESCE(excluded.score_sum, 0),
+                    score_max = MAX(COALESCE(score_max, excluded.score_max), COALESCE(excluded.score_max, score_max))
+            """, (last_id, max_id))
+        conn.execute("INSERT OR REPLACE INTO rollup_state (name, last_id) VALUES (?, ?)", (table, max_id))
+    return max_id - last_id
+
+
+def raw_coverage_start(conn, kind):
+    """First hour whose buckets raw rows still fully cover, or None when the table is empty.
+
+    Older buckets only survive in the rollups, so they must never be rebuilt from raw
+    rows. The oldest raw hour counts as covered unless its hour rollup holds more rows
+    than are left, i.e. the purge cut into it.
+    """
+    table = TABLES[kind]
+    oldest = conn.execute(f"SELECT MIN(timestamp) FROM {table}").fetchone()[0]
+    if oldest is None:
+        return None
+    hour = pd.Timestamp(oldest).floor("h")
+    next_hour = hour + pd.Timedelta(hours=1)
+    raw = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE timestamp >= ? AND timestamp < ?",
+                       (format_timestamp(hour), format_timestamp(next_hour))).fetchone()[0]
+    folded = conn.execute(f"SELECT count FROM {table}_rollup_hour WHERE bucket = ?", (_epoch(hour),)).fetchone()
+    purged = folded is not None and folded[0] > raw
+    return (next_hour if purged else hour).to_pydatetime()
+
+
+def refold_rollups(conn, kind, start, end):
+    """Recompute rollup buckets in [start, end) from the raw rows already folded in.
+
+    For rows whose scores changed in place (backfills). Runs inside the caller's
+    transaction; start and end should sit on hour boundaries so no bucket is cut.
+    The range is clamped to raw_coverage_start(), so purged history is kept.
+    """
+    table = TABLES[kind]
+    covered = raw_coverage_start(conn, kind)
+    if covered is None or covered >= pd.Timestamp(end):
+        return
+    start = max(pd.Timestamp(start), pd.Timestamp(covered))
+    row = conn.execute("SELECT last_id FROM rollup_state WHERE name = ?", (table,)).fetchone()
+    last_id = row[0] if row else 0
+    for resolution, seconds in ROLLUP_RESOLUTIONS.items():
+        conn.execute(f"DELETE FROM {table}_rollup_{resolution} WHERE bucket >= ? AND bucket < ?",
+                     (_epoch(start), _epoch(end)))
+        conn.execute(f"""
+            INSERT INTO {table}_rollup_{resolution} (bucket, count, anomalies, score_min, score_sum, score_max)
+            SELECT CAST(strftime('%s', timestamp) AS INTEGER) / {seconds} * {seconds} AS bucket,
+                   COUNT(*), COALESCE(SUM(is_anomaly), 0),
+                   MIN(anomaly_score), SUM(anomaly_score), MAX(anomaly_score)
+            FROM {table}
+            WHERE timestamp >= ? AND timestamp < ? AND id <= ?
+            GROUP BY bucket
+        """, (format_timestamp(start), format_timestamp(end), last_id))
+
+
+def purge_expired(store, kind, raw_ttl_days=RAW_TTL_DAYS, now=None):
+    """Drop raw rows older than the TTL one day-partition per transaction, then expired rollups."""
+    table = TABLES[kind]
+    conn = store.connection()
+    now = to_utc_naive(now or utc_now()).to_pydatetime()
+    cutoff = now - timedelta(days=raw_ttl_days)
+    oldest = conn.execute(f"SELECT MIN(timestamp) FROM {table}").fetchone()[0]
+    deleted = 0
+    if oldest is not None:
+        day = pd.Timestamp(oldest).normalize().to_pydatetime()
+        while day < cutoff:
+            upper = min(day + timedelta(days=1), cutoff)
+            with conn:
+                deleted += conn.execute(
+                    f"DELETE FROM {table} WHERE timestamp >= ? AND timestamp < ?",
+                    (day.strftime("%Y-%m-%d %H:%M:%S"), upper.strftime("%Y-%m-%d %H:%M:%S")),
+                ).rowcount
+            day = upper
+    with conn:
+        for resolution, ttl_days in ROLLUP_TTL_DAYS.items():
+            conn.execute(f"DELETE FROM {table}_rollup_{resolution} WHERE bucket < ?",
+                         (_epoch(now - timedelta(days=ttl_days)),))
+    return deleted
+
+
+# --- Rollup Readers ---
+def _rollup_table(kind, span_seconds):
+    resolution = "minute" if span_seconds <= MINUTE_ROLLUP_MAX_SPAN else "hour"
+    return f"{TABLES[kind]}_rollup_{resolution}", ROLLUP_RESOLUTIONS[resolution]
+
+
+def rollup_summary(store, kind, start, now=None):
+    """Totals since `start` read from rollups: total, anomalies, recent_attacks (last hour).
+
+    The window starts at the rollup bucket containing `start`.
+    """
+    now = to_utc_naive(now or utc_now()).to_pydatetime()
+    start_epoch, now_epoch = _epoch(start), _epoch(now)
+    source, resolution = _rollup_table(kind, now_epoch - start_epoch)
+    conn = store.connection()
+    total, anomalies = conn.execute(
+        f"SELECT COALESCE(SUM(count), 0), COALESCE(SUM(anomalies), 0) FROM {source} WHERE bucket >= ?",
+        (start_epoch - start_epoch % resolution,),
+    ).fetchone()
+    recent = conn.execute(
+        f"SELECT COALESCE(SUM(anomalies), 0) FROM {TABLES[kind]}_rollup_minute WHERE bucket >= ?",
+        (now_epoch - 3600,),
+    ).fetchone()[0]
+    return {"total": total, "anomalies": anomalies, "recent_attacks": recent}
+
+
+def rollup_series(store, kind, start, bucket_seconds, now=None):
+    """Chart series (count, anomalies, mean/min/max score) re-bucketed from the rollups."""
+    now = to_utc_naive(now or utc_now()).to_pydatetime()
+    start_epoch = _epoch(start)
+    source, resolution = _rollup_table(kind, _epoch(now) - start_epoch)
+    df = pd.read_sql_query(f"""
+        SELECT bucket / ? * ? AS bucket,
+               SUM(count) AS count,
+               SUM(anomalies) AS anomalies,
+               SUM(score_sum) / SUM(count) AS mean_score,
+               MIN(score_min) AS min_score,
+               MAX(score_max) AS max_score
+        FROM {source}
+        WHERE bucket >= ?
+        GROUP BY 1
+        ORDER BY 1
+    """, store.connection(), params=(bucket_seconds, bucket_seconds, start_epoch - start_epoch % resolution))
+    df["timestamp"] = pd.to_datetime(df["bucket"], unit="s")
+    return df.drop(columns="bucket")
+
+
+# --- Background Worker ---
+class RollupWorker(threading.Thread):
+    def __init__(self, store, interval=ROLLUP_INTERVAL, raw_ttl_days=RAW_TTL_DAYS):
+        super().__init__(name="prediction-rollups", daemon=True)
+        self.store = store
+        self.interval = interval
+        self.raw_ttl_days = raw_ttl_days
+        self._last_purge = 0.0
+        self._stop_event = threading.Event()
+
+    def run_once(self):
+        for kind in TABLES:
+            update_rollups(self.store, kind)
+        if time.time() - self._last_purge > 3600:
+            for kind in TABLES:
+                purge_expired(self.store, kind, self.raw_ttl_days)
+            self._last_purge = time.time()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Rollup error: {e}")
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+
+def start_rollup_worker(store, **kwargs):
+    with _workers_lock:
+        if store.path not in _workers:
+            _workers[store.path] = RollupWorker(store, **kwargs)
+            _workers[store.path].start()
+        return _workers[store.path]
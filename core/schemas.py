@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+
+# --- Traffic Schemas ---
+# One definition per traffic type: where its points live in InfluxDB, which
+# fields the models score, and the names used by the store, API and UI.
+
+
+@dataclass(frozen=True)
+class TrafficSchema:
+    kind: str                 # "dns" / "dos": store table and API route
+    label: str                # "DNS" / "DoS" as shown in the UI and alerts
+    bucket: str
+    measurement: str
+    features: tuple[str, ...]
+
+    @property
+    def dtypes(self) -> dict[str, str]:
+        return {"timestamp": "datetime64[ns]", **{f: "float64" for f in self.features}}
+
+    def endpoint(self, api_url: str) -> str:
+        return f"{api_url.rstrip('/')}/predict/{self.kind}"
+
+    def missing(self, columns) -> list[str]:
+        return [f for f in self.features if f not in columns]
+
+
+DNS = TrafficSchema("dns", "DNS", "realtime_dns", "dns", ("dns_rate", "inter_arrival_time"))
+DOS = TrafficSchema("dos", "DoS", "realtime", "network_traffic", ("packet_rate", "packet_length", "inter_arrival_time"))
+SCHEMAS = {schema.kind: schema for schema in (DNS, DOS)}
+
+
+def get_schema(name: str) -> TrafficSchema:
+    """Schema by kind or label, case-insensitive ("dns", "DNS", "DoS", ...)."""
+    return SCHEMAS[name.lower()]
@@ -0,0 +1,117 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from core.inference import predict_batch, supports_batch
+from core.local_scorer import MODEL_PATHS, load_model, score_frame_local
+from core.pipeline import predict_rows
+from core.prediction_cache import get_cache, make_namespace, score_cached
+from core.telemetry import traced
+
+# --- Scorers ---
+# Every backend answers score(df) -> (anomaly int8, score float, ok bool)
+# arrays aligned with df, so callers never care where the model runs.
+# score_frame() attaches the result as `anomaly` / `reconstruction_error`.
+
+BACKENDS = ("remote", "local")
+BACKEND_LABELS = {"Remote API": "remote", "Local model": "local"}  # sidebar choice -> backend
+
+
+class Scorer(ABC):
+    def __init__(self, schema):
+        self.schema = schema
+        self.features = list(schema.features)
+
+    @property
+    @abstractmethod
+    def namespace(self):
+        """Prediction-cache key prefix: whatever changes the scores must change this."""
+
+    @abstractmethod
+    def score(self, df):
+        """(anomaly, score, ok) arrays aligned with df."""
+
+    @property
+    def derived_features(self):
+        """Whether the model reads columns from core.features; if not, callers skip that step."""
+        return bool(set(self.features) - set(self.schema.features))
+
+    def score_frame(self, df):
+        """Copy of df with `anomaly` and `reconstruction_error` columns, plus the ok mask."""
+        anomaly, score, ok = self.score(df)
+        return df.assign(anomaly=anomaly, reconstruction_error=score), ok
+
+
+class RemoteScorer(Scorer):
+    """The prediction API: batched route when it exists, else concurrent per-row posts."""
+
+    def __init__(self, schema, api_url, budget=None):
+        super().__init__(schema)
+        self.endpoint = schema.endpoint(api_url)
+        self.budget = budget  # seconds per score() call on either route; None waits for every row
+
+    @property
+    def namespace(self):
+        return self.endpoint
+
+    @traced("scoring.remote")
+    def score(self, df):
+        if supports_batch(self.endpoint):
+            return predict_batch(self.endpoint, df, self.features, budget=self.budget)
+        return predict_rows(self.endpoint, df, self.features, budget=self.budget)
+
+
+class LocalScorer(Scorer):
+    """The joblib model for this traffic type, loaded once and scored in-process."""
+
+    def __init__(self, schema, path=None):
+        super().__init__(schema)
+        self.path = path or MODEL_PATHS[schema.kind]
+        self.mtime = int(os.path.getmtime(self.path))  # before loading, so a mid-load retrain looks newer
+        self.bundle = load_model(self.path)
+        # A bundle may be trained on derived columns from core.features as well as raw fields
+        self.features = list(self.bundle["features"] or schema.features)
+
+    @property
+    def namespace(self):
+        # A retrained model file (new mtime) must not be answered from the old model's cache entries
+        return f"local:{self.path}@{self.mtime}"
+
+    @traced("scoring.local")
+    def score(self, df):
+        return score_frame_local(self.bundle, df, self.features)
+
+
+class CachedScorer(Scorer):
+    """Wraps another scorer; feature vectors seen before are answered from the prediction cache."""
+
+    def __init__(self, scorer, cache, model_version):
+        super().__init__(scorer.schema)
+        self.features = scorer.features  # hash exactly what the inner model reads
+        self.scorer = scorer
+        self.cache = cache
+        self.model_version = model_version
+
+    @property
+    def namespace(self):
+        return make_namespace(self.scorer.namespace, self.schema.label, self.model_version)
+
+    @traced("scoring.cached")
+    def score(self, df):
+        return score_cached(self.cache, self.namespace, df, self.features, self.scorer.score)
+
+
+_scorers = {}
+_scorers_lock = threading.Lock()
+
+
+def get_scorer(schema, backend="remote", api_url=None, model_version="v1", cache_db=None, budget=None):
+    """Process-wide cached scorer, so models, HTTP pools and cache entries are shared."""
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown scoring backend {backend!r}")
+    key = (schema.kind, backend, api_url, model_version, cache_db, budget)
+    with _scorers_lock:
+        if key not in _scorers:
+            inner = RemoteScorer(schema, api_url, budget) if backend == "remote" else LocalScorer(schema)
+            _scorers[key] = CachedScorer(inner, get_cache(cache_db), model_version)
+        return _scorers[key]
+
@@ -0,0 +1,52 @@
+from core.pipeline import log_stage
+
+# --- Sinks ---
+# Where scored frames (with `anomaly` / `reconstruction_error` columns) go.
+# write(df) returns how many rows were accepted.
+
+
+class StoreSink:
+    """Bulk insert into the prediction store."""
+
+    def __init__(self, store, schema):
+        self.store = store
+        self.schema = schema
+
+    def write(self, df):
+        if df.empty:
+            return 0
+        return self.store.insert_many(self.schema.kind, df.to_dict("records"))
+
+
+class AlertSink:
+    """Queue the anomalous rows on the Discord dispatcher (coalesced and rate-limited there)."""
+
+    def __init__(self, dispatcher, schema):
+        self.dispatcher = dispatcher
+        self.schema = schema
+
+    def write(self, df):
+        if self.dispatcher is None or df.empty:
+            return 0
+        anomalies = df[df["anomaly"] == 1]
+        if not anomalies.empty:
+            self.dispatcher.submit_frame(self.schema.label, anomalies, score_col="reconstruction_error")
+        return len(anomalies)
+
+
+class BackgroundSink:
+    """Hand writes to a BackgroundStage so a slow sink never blocks a rerun."""
+
+    def __init__(self, sink, stage=log_stage):
+        self.sink = sink
+        self.stage = stage
+
+    def write(self, df):
+        if df.empty:
+            return 0
+        self.stage.submit(self.sink.write, df)
+        return len(df)
+
+
+def write_all(sinks, df):
+    return [sink.write(df) for sink in sinks]
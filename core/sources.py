@@ -0,0 +1,61 @@
+import threading
+from core.downsample import flux_duration
+from core.influx_stream import (CHUNK_ROWS, build_aggregated_query, build_flux_query, iter_influx_chunks,
+                                read_influx_frame)
+from core.telemetry import traced
+
+# --- Sources ---
+# Read-side access to raw points for one traffic type in InfluxDB (scored
+# predictions are read straight from core.store). Frames always carry
+# `timestamp` plus the schema's features.
+
+_influx_clients = {}
+_influx_lock = threading.Lock()
+
+
+def get_influx_client(url, token, org):
+    """One pooled client per server and org for the whole process."""
+    key = (url, token, org)
+    with _influx_lock:
+        if key not in _influx_clients:
+            from influxdb_client import InfluxDBClient  # deferred until a view actually queries InfluxDB
+
+            _influx_clients[key] = InfluxDBClient(url=url, token=token, org=org)
+        return _influx_clients[key]
+
+
+class InfluxSource:
+    def __init__(self, client, schema):
+        self.client = client
+        self.schema = schema
+        self.features = list(schema.features)
+
+    def _query(self, start_range, limit=None):
+        return build_flux_query(self.schema.bucket, self.schema.measurement, self.features, start_range, limit)
+
+    @traced("influx.read")
+    def read(self, start_range="-1h", limit=None):
+        """Whole window (streamed and parsed in chunks), or its first `limit` points."""
+        query_api = self.client.query_api()
+        if limit is None:
+            return read_influx_frame(query_api, self._query(start_range), self.features)
+        df = query_api.query_data_frame(self._query(start_range, limit))
+        return df.rename(columns={"_time": "timestamp"})
+
+    def iter_chunks(self, start_range="-1h", chunk_rows=CHUNK_ROWS, tags=False):
+        yield from iter_influx_chunks(self.client.query_api(), self._query(start_range), self.features, chunk_rows,
+                                      tags)
+
+    @traced("influx.read_aggregated")
+    def read_aggregated(self, start_range, window_seconds, fn="mean"):
+        query = build_aggregated_query(self.schema.bucket, self.schema.measurement, self.features, start_range,
+                                       flux_duration(window_seconds), fn)
+        return read_influx_frame(self.client.query_api(), query, self.features)
+
+    def tail(self, cursor, chunk_rows=CHUNK_ROWS):
+        """Chunks of points newer than `cursor` as it stood before the fetch; it ends at the batch's newest point."""
+        since = cursor.last_time
+        for chunk in self.iter_chunks(cursor.start_range(), chunk_rows, tags=True):
+            new_rows = cursor.advance(chunk, since=since)
+            if not new_rows.empty:
+                yield new_rows
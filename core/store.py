@@ -0,0 +1,309 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+import pandas as pd
+from core.schemas import SCHEMAS
+from core.telemetry import traced
+
+# --- Prediction Store ---
+# One long-lived WAL connection per thread, schema managed through
+# PRAGMA user_version migrations, and range predicates written so the
+# timestamp index can serve them.
+
+TABLES = {"dns": "dns_predictions", "dos": "dos_predictions"}
+FEATURE_COLUMNS = {kind: list(schema.features) for kind, schema in SCHEMAS.items()}
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def _create_table(kind):
+    features = "".join(f"{c} REAL,\n                " for c in FEATURE_COLUMNS[kind])
+    return f"""
+            CREATE TABLE IF NOT EXISTS {TABLES[kind]} (
+                id INTEGER PRIMARY KEY,
+                timestamp TEXT NOT NULL,
+                {features}anomaly_score REAL,
+                reconstruction_error REAL,
+                is_anomaly INTEGER NOT NULL DEFAULT 0
+            )"""
+
+
+def _autoincrement_ids(kind):
+    # Without AUTOINCREMENT a table emptied by the purge hands out ids at or below the
+    # rollup watermark again, and update_rollups would never fold those rows.
+    table = TABLES[kind]
+    columns = ", ".join(["id", "timestamp", *FEATURE_COLUMNS[kind], "anomaly_score", "reconstruction_error",
+                         "is_anomaly", "is_attack"])
+    features = "".join(f"{c} REAL,\n                " for c in FEATURE_COLUMNS[kind])
+    return [
+        f"""
+            CREATE TABLE {table}_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                {features}anomaly_score REAL,
+                reconstruction_error REAL,
+                is_anomaly INTEGER NOT NULL DEFAULT 0,
+                is_attack REAL
+            )""",
+        f"INSERT INTO {table}_new ({columns}) SELECT {columns} FROM {table}",
+        f"DROP TABLE {table}",
+        f"ALTER TABLE {table}_new RENAME TO {table}",
+        f"CREATE INDEX IF NOT EXISTS idx_{table}_timestamp ON {table}(timestamp)",
+        # New ids start past the watermark even when the table is empty right now
+        f"DELETE FROM sqlite_sequence WHERE name = '{table}'",
+        f"""INSERT INTO sqlite_sequence (name, seq) SELECT '{table}', MAX(
+                (SELECT COALESCE(MAX(id), 0) FROM {table}),
+                COALESCE((SELECT last_id FROM rollup_state WHERE name = '{table}'), 0))""",
+    ]
+
+
+ROLLUP_RESOLUTIONS = {"minute": 60, "hour": 3600}
+
+
+def _create_rollup(table, resolution):
+    return f"""
+            CREATE TABLE IF NOT EXISTS {table}_rollup_{resolution} (
+                bucket INTEGER PRIMARY KEY,
+                count INTEGER NOT NULL,
+                anomalies INTEGER NOT NULL,
+                score_min REAL,
+                score_sum REAL,
+                score_max REAL
+            )"""
+
+
+MIGRATIONS = [
+    [_create_table("dns"), _create_table("dos")],
+    [f"CREATE INDEX IF NOT EXISTS idx_{table}_timestamp ON {table}(timestamp)" for table in TABLES.values()],
+    [_create_rollup(table, resolution) for table in TABLES.values() for resolution in ROLLUP_RESOLUTIONS]
+    + ["CREATE TABLE IF NOT EXISTS rollup_state (name TEXT PRIMARY KEY, last_id INTEGER NOT NULL)"],
+    ["CREATE TABLE IF NOT EXISTS worker_status (name TEXT PRIMARY KEY, heartbeat REAL NOT NULL, rows INTEGER NOT NULL DEFAULT 0)"],
+    # Optional ground-truth label (NULL when unknown) for precision/recall on stored windows
+    [f"ALTER TABLE {table} ADD COLUMN is_attack REAL" for table in TABLES.values()],
+    # Shards finished by backfill.py, so an interrupted re-score resumes where it stopped
+    ["CREATE TABLE IF NOT EXISTS backfill_progress (job TEXT NOT NULL, shard_start TEXT NOT NULL, "
+     "rows INTEGER NOT NULL, finished REAL NOT NULL, PRIMARY KEY (job, shard_start))"],
+    [statement for kind in TABLES for statement in _autoincrement_ids(kind)],
+    # Range each backfill job resolved on its first run, so a resume re-plans the same shards
+    ["CREATE TABLE IF NOT EXISTS backfill_jobs (job TEXT PRIMARY KEY, kind TEXT NOT NULL, "
+     "range_start TEXT NOT NULL, range_end TEXT NOT NULL, created REAL NOT NULL)"],
+    # Bumped by in-place rewrites (backfills), which COUNT/MAX(id) cannot see
+    ["CREATE TABLE IF NOT EXISTS table_revisions (name TEXT PRIMARY KEY, revision INTEGER NOT NULL)"],
+]
+
+
+ADD_COLUMN = re.compile(r"ALTER TABLE (\w+) ADD COLUMN (\w+)", re.IGNORECASE)
+
+
+def _already_applied(conn, statement):
+    # ADD COLUMN has no IF NOT EXISTS; a column that is already there must not fail the step
+    match = ADD_COLUMN.match(statement.strip())
+    if match is None:
+        return False
+    table, column = match.groups()
+    return any(r[1] == column for r in conn.execute(f"PRAGMA table_info({table})").fetchall())
+
+
+def migrate(conn):
+    # Several processes (app, worker, backfill workers) open the store at once: each step takes
+    # the write lock first and re-reads user_version, so only one of them applies it
+    while True:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= len(MIGRATIONS):
+                return len(MIGRATIONS)
+            for statement in MIGRATIONS[version]:
+                if not _already_applied(conn, statement):
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version + 1}")
+
+
+def utc_now():
+    """Current time as naive UTC, the form every stored timestamp is in."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def to_utc_naive(value):
+    """pd.Timestamp in naive UTC; aware values are converted, naive ones are taken as UTC."""
+    ts = pd.Timestamp(value)
+    return ts.tz_convert("UTC").tz_localize(None) if ts.tzinfo is not None else ts
+
+
+def bump_revision(conn, kind):
+    """Mark rows of `kind` as rewritten in place; call inside the transaction that updates them."""
+    conn.execute("INSERT INTO table_revisions (name, revision) VALUES (?, 1) "
+                 "ON CONFLICT(name) DO UPDATE SET revision = revision + 1", (TABLES[kind],))
+
+
+def format_timestamp(value):
+    return to_utc_naive(value).strftime(TIMESTAMP_FORMAT)
+
+
+def _bound(value):
+    # Dates bound whole days; datetimes are compared as stored text.
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    return format_timestamp(value)
+
+
+class PredictionStore:
+    def __init__(self, path):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._local = threading.local()
+        self._columns = {}
+        migrate(self.connection())
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def column_types(self, kind):
+        """Declared SQLite type of every column, including id."""
+        rows = self.connection().execute(f"PRAGMA table_info({TABLES[kind]})").fetchall()
+        return {r[1]: r[2] for r in rows}
+
+    def table_columns(self, kind):
+        if kind not in self._columns:
+            rows = self.connection().execute(f"PRAGMA table_info({TABLES[kind]})").fetchall()
+            self._columns[kind] = [r[1] for r in rows if r[1] != "id"]
+        return self._columns[kind]
+
+    # --- Reads ---
+    def _range_clauses(self, start, end):
+        # start <= timestamp < end; a `date` end includes that whole day.
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(_bound(start))
+        if end is not None:
+            if isinstance(end, date) and not isinstance(end, datetime):
+                end = end + timedelta(days=1)
+            clauses.append("timestamp < ?")
+            params.append(_bound(end))
+        return clauses, params
+
+    def _read(self, query, params):
+        df = pd.read_sql_query(query, self.connection(), params=params)
+        if "timestamp" in df.columns:
+            df["timestamp"] = pd.to_datetime(df["timestamp"], format="ISO8601")
+        return df
+
+    @traced("sqlite.read_range")
+    def read_range(self, kind, start=None, end=None, columns="*", order="ASC"):
+        """Rows with start <= timestamp < end; a `date` end includes that whole day."""
+        clauses, params = self._range_clauses(start, end)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._read(f"SELECT {columns} FROM {TABLES[kind]} {where} ORDER BY timestamp {order}", params)
+
+    def iter_range(self, kind, start=None, end=None, chunk_rows=50_000):
+        """read_range in DataFrame chunks, so exports never hold the whole range."""
+        clauses, params = self._range_clauses(start, end)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"SELECT * FROM {TABLES[kind]} {where} ORDER BY timestamp ASC, id ASC"
+        for chunk in pd.read_sql_query(query, self.connection(), params=params, chunksize=chunk_rows):
+            chunk["timestamp"] = pd.to_datetime(chunk["timestamp"], format="ISO8601")
+            yield chunk
+
+    def range_version(self, kind, start=None, end=None):
+        """(row count, max id, table revision) of a range; changes when rows are added, purged or rewritten."""
+        clauses, params = self._range_clauses(start, end)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        conn = self.connection()
+        count, max_id = conn.execute(f"SELECT COUNT(*), MAX(id) FROM {TABLES[kind]} {where}", params).fetchone()
+        revision = conn.execute("SELECT revision FROM table_revisions WHERE name = ?", (TABLES[kind],)).fetchone()
+        return count, max_id, revision[0] if revision else 0
+
+    @traced("sqlite.count_range", rows=None)
+    def count_range(self, kind, start=None, end=None):
+        clauses, params = self._range_clauses(start, end)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self.connection().execute(f"SELECT COUNT(*) FROM {TABLES[kind]} {where}", params).fetchone()[0]
+
+    @traced("sqlite.read_page")
+    def read_page(self, kind, start=None, end=None, limit=100, offset=0, after=None, order="ASC"):
+        """One page of a range, ordered by (timestamp, id).
+
+        `after` is the (stored timestamp text, id) of the previous page's last row; when
+        given, the page is a keyset seek on the timestamp index and `offset` is ignored.
+        """
+        clauses, params = self._range_clauses(start, end)
+        if after is not None:
+            clauses.append(f"(timestamp, id) {'>' if order == 'ASC' else '<'} (?, ?)")
+            params.extend(after)
+            offset = 0
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._read(
+            f"SELECT * FROM {TABLES[kind]} {where} ORDER BY timestamp {order}, id {order} LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        )
+
+    @traced("sqlite.read_latest")
+    def read_latest(self, kind, limit=1000):
+        """Newest `limit` rows, oldest first; served backwards from the timestamp index."""
+        return self._read(
+            f"SELECT * FROM (SELECT * FROM {TABLES[kind]} ORDER BY timestamp DESC LIMIT ?) ORDER BY timestamp ASC",
+            (limit,),
+        )
+
+    def latest_timestamp(self, kind):
+        value = self.connection().execute(f"SELECT MAX(timestamp) FROM {TABLES[kind]}").fetchone()[0]
+        return pd.Timestamp(value) if value is not None else None
+
+    # --- Worker Status ---
+    def heartbeat(self, name, rows=0):
+        conn = self.connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO worker_status (name, heartbeat, rows) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET heartbeat = excluded.heartbeat, rows = rows + excluded.rows",
+                (name, time.time(), rows),
+            )
+
+    def worker_alive(self, name, max_age=60):
+        row = self.connection().execute("SELECT heartbeat FROM worker_status WHERE name = ?", (name,)).fetchone()
+        return row is not None and time.time() - row[0] <= max_age
+
+    # --- Writes ---
+    @traced("sqlite.insert_many", rows=int)
+    def insert_many(self, kind, records):
+        """Insert prediction dicts in one transaction; unknown keys are ignored."""
+        columns = self.table_columns(kind)
+        rows = []
+        for record in records:
+            record = dict(record)
+            record["timestamp"] = format_timestamp(record.get("timestamp", utc_now()))
+            if "is_anomaly" not in record:
+                record["is_anomaly"] = int(record.get("anomaly", 0))
+            if "anomaly_score" not in record:
+                record["anomaly_score"] = record.get("reconstruction_error", record.get("score"))
+            rows.append(tuple(record.get(c) for c in columns))
+        if not rows:
+            return 0
+        conn = self.connection()
+        with conn:
+            conn.executemany(
+                f"INSERT INTO {TABLES[kind]} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                rows,
+            )
+        return len(rows)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path):
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = PredictionStore(path)
+        return _stores[path]
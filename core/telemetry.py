@@ -0,0 +1,189 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- Telemetry ---
+# Process-wide latency histograms, call/row/error counts per operation, plus
+# plain counters (cache hits, alert outcomes). Recording is a lock and a few
+# integer adds, so it stays on in production; the Performance tab reads it,
+# and start_metrics_server() exposes it in Prometheus text format.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRIC_PREFIX = "anomaly_dashboard"
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with call, row and error totals."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.rows = 0
+        self.errors = 0
+        self.max = 0.0
+
+    def observe(self, seconds, rows=0, error=False):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.rows += rows
+        self.errors += int(error)
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Estimate by linear interpolation inside the bucket holding the q-th observation."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+
+class Telemetry:
+    def __init__(self):
+        self.histograms = {}  # operation -> Histogram
+        self.counters = {}    # name -> int
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, rows=0, error=False):
+        with self._lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram()
+            self.histograms[name].observe(seconds, rows, error)
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + int(value)
+
+    def hit_rate(self, prefix):
+        """Share of `<prefix>.hits` among hits and misses, or None before any lookup."""
+        hits, misses = self.counters.get(f"{prefix}.hits", 0), self.counters.get(f"{prefix}.misses", 0)
+        return hits / (hits + misses) if hits + misses else None
+
+    def snapshot(self):
+        """One row per operation: calls, rows, errors and latency statistics in seconds."""
+        with self._lock:
+            return [
+                {"operation": name, "calls": h.count, "rows": h.rows, "errors": h.errors,
+                 "mean": h.total / h.count, "p50": h.quantile(0.5), "p95": h.quantile(0.95),
+                 "p99": h.quantile(0.99), "max": h.max, "total": h.total}
+                for name, h in sorted(self.histograms.items())
+            ]
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.started = time.time()
+
+    def prometheus(self):
+        """Everything recorded so far in the Prometheus text exposition format."""
+        p = METRIC_PREFIX
+        lines = [f"# HELP {p}_latency_seconds Latency of instrumented operations.",
+                 f"# TYPE {p}_latency_seconds histogram"]
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+            for name, h in histograms:
+                cumulative = 0
+                for bound, n in zip((*h.buckets, "+Inf"), h.counts):
+                    cumulative += n
+                    lines.append(f'{p}_latency_seconds_bucket{{operation="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{p}_latency_seconds_sum{{operation="{name}"}} {h.total}')
+                lines.append(f'{p}_latency_seconds_count{{operation="{name}"}} {h.count}')
+        for metric, attr, help_text in (("rows_total", "rows", "Rows processed by instrumented operations."),
+                                        ("errors_total", "errors", "Instrumented operations that raised.")):
+            lines += [f"# HELP {p}_{metric} {help_text}", f"# TYPE {p}_{metric} counter"]
+            lines += [f'{p}_{metric}{{operation="{name}"}} {getattr(h, attr)}' for name, h in histograms]
+        lines += [f"# HELP {p}_events_total Named event counters (cache hits, alert outcomes, ...).",
+                  f"# TYPE {p}_events_total counter"]
+        lines += [f'{p}_events_total{{event="{name}"}} {value}' for name, value in counters]
+        return "\n".join(lines) + "\n"
+
+
+telemetry = Telemetry()
+
+
+# --- Instrumentation ---
+class Span:
+    def __init__(self):
+        self.rows = 0
+
+
+@contextmanager
+def span(name):
+    """Time the block as `name`; set `.rows` on the yielded span to count rows processed."""
+    current = Span()
+    started = time.perf_counter()
+    error = False
+    try:
+        yield current
+    except BaseException:
+        error = True
+        raise
+    finally:
+        telemetry.observe(name, time.perf_counter() - started, current.rows, error)
+
+
+def frame_rows(result):
+    """Rows in a DataFrame result (or the first element of a tuple result)."""
+    if isinstance(result, tuple):
+        result = result[0] if result else None
+    return len(result) if hasattr(result, "__len__") and not isinstance(result, (str, bytes, dict)) else 0
+
+
+def traced(name, rows=frame_rows):
+    """Decorator form of span(); `rows(result)` gives the rows processed by one call."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name) as current:
+                result = fn(*args, **kwargs)
+                current.rows = rows(result) if rows else 0
+                return result
+        return wrapper
+    return decorate
+
+
+# --- Prometheus Endpoint ---
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = telemetry.prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_servers = {}
+_servers_lock = threading.Lock()
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Serve /metrics on (host, port) in a daemon thread, once per process."""
+    key = (host, int(port))
+    with _servers_lock:
+        if key not in _servers:
+            server = ThreadingHTTPServer(key, _MetricsHandler)
+            threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+            _servers[key] = server
+        return _servers[key]
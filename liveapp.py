@@ -1,11 +1,17 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import requests
-import plotly.express as px
-from influxdb_client import InfluxDBClient
-from datetime import datetime
 from streamlit_autorefresh import st_autorefresh
+from core import (AlertSink, FeaturePipeline, InfluxSource, add_features, get_influx_client, get_schema,
+                  get_scorer)
+from core.alerts import get_dispatcher
+from core.config import DEFAULT_API_URL, DEFAULT_MODEL_VERSION
+from core.downsample import range_seconds, pick_window_seconds, lttb_frame, aggregate_scores
+from core.influx_tail import TailCursor
+from core.prediction_cache import get_cache
+from core.scoring import BACKEND_LABELS
+from core.store import utc_now
+from core.telemetry import traced
 
 # --- Configuration ---
 st.set_page_config(page_title="Unified Anomaly Detection Dashboard", layout="wide")
@@ -16,6 +22,9 @@ INFLUXDB_URL = st.secrets["INFLUXDB_URL"]
 INFLUXDB_ORG = st.secrets["INFLUXDB_ORG"]
 INFLUXDB_TOKEN = st.secrets["INFLUXDB_TOKEN"]
 DISCORD_WEBHOOK = st.secrets["DISCORD_WEBHOOK"]
+PREDICT_API_URL = st.secrets.get("PREDICT_API_URL", DEFAULT_API_URL)
+MODEL_VERSION = st.secrets.get("MODEL_VERSION", DEFAULT_MODEL_VERSION)
+PREDICTION_CACHE_DB = st.secrets.get("PREDICTION_CACHE_DB")  # e.g. "data/prediction_cache.db"
 
 # --- Constants ---
 time_range_query_map = {
@@ -27,118 +36,182 @@ highlight_color = "red"
 st.sidebar.title("Settings")
 dashboard_choice = st.sidebar.radio("Choose Dashboard", ["DNS", "DoS"])
 time_range = st.sidebar.selectbox("Time Range", list(time_range_query_map.keys()), index=1)
+scoring_backend = st.sidebar.radio("Scoring Backend", ["Remote API", "Local model"], horizontal=True)
 threshold = st.sidebar.slider("Anomaly Threshold", 0.01, 1.0, 0.1, 0.01)
 alerts_enabled = st.sidebar.checkbox("Enable Discord Alerts", value=True)
 
+# --- Shared Logic ---
+schema = get_schema(dashboard_choice)
+features = list(schema.features)
+
 # --- InfluxDB Queries ---
-def query_influx(bucket, measurement, fields, start_range="-1h", limit=200):
+INFLUX_CACHE_TTL = 5  # seconds; shorter than the live refresh so new points still show up
+RAW_CACHE_ENTRIES = 2  # whole raw windows (up to 7 days of points) held at once, across all sessions
+
+def get_source(kind):
+    # Pooled client shared per process with the tabs app and every session.
+    client = get_influx_client(INFLUXDB_URL, INFLUXDB_TOKEN, INFLUXDB_ORG)
+    return InfluxSource(client, get_schema(kind))
+
+@st.cache_data(ttl=INFLUX_CACHE_TTL, max_entries=RAW_CACHE_ENTRIES, show_spinner=False)
+def _fetch_influx(kind, start_range):
+    return get_source(kind).read(start_range)
+
+@traced("query_influx")
+def query_influx(start_range="-1h"):
+    # The whole window, streamed. Keyed on (type, range): tabs and sessions asking for the
+    # same window inside the TTL share one fetch, and only RAW_CACHE_ENTRIES stay cached.
+    # The live stream tails with InfluxSource.tail() instead.
     try:
-        with InfluxDBClient(url=INFLUXDB_URL, token=INFLUXDB_TOKEN, org=INFLUXDB_ORG) as client:
-            query = f'''from(bucket: "{bucket}")
-            |> range(start: {start_range})
-            |> filter(fn: (r) => r._measurement == "{measurement}")
-            |> filter(fn: (r) => { ' or '.join([f'r._field == "{f}"' for f in fields]) })
-            |> pivot(rowKey:["_time"], columnKey:["_field"], valueColumn:"_value")
-            |> sort(columns: ["_time"], desc: false)
-            |> limit(n:{limit})'''
-            df = client.query_api().query_data_frame(query)
-            df = df.rename(columns={"_time": "timestamp"})
-            return df
+        return _fetch_influx(schema.kind, start_range)
     except Exception as e:
         st.error(f"InfluxDB error: {e}")
         return pd.DataFrame()
 
-# --- Anomaly Detection via API ---
-def detect_anomalies(endpoint, df, features):
-    results = []
-    for _, row in df.iterrows():
-        try:
-            data = {f: row[f] for f in features}
-            response = requests.post(endpoint, json=data)
-            result = response.json()
-            row["anomaly"] = result["anomaly"]
-            row["score"] = result.get("anomaly_score", result.get("reconstruction_error", 0.0))
-        except:
-            row["anomaly"] = 0
-            row["score"] = 0
-        results.append(row)
-    return pd.DataFrame(results)
+@st.cache_data(ttl=INFLUX_CACHE_TTL, max_entries=32, show_spinner=False)
+def _fetch_influx_aggregated(kind, start_range, window_seconds, fn):
+    return get_source(kind).read_aggregated(start_range, window_seconds, fn)
 
-# --- Discord Alert ---
-def send_discord_alert(row, typ="DNS"):
-    message = {
-        "content": f"🚨 **{typ} Anomaly Detected!**\n"
-                   f"**Time:** {row['timestamp']}\n"
-                   f"**Score:** {row['score']:.4f}"
-    }
+@traced("query_influx_aggregated")
+def query_influx_aggregated(start_range="-1h", fn="mean"):
+    # Resolution-aware: the aggregateWindow is picked from the range and chart width,
+    # so the result has at most ~CHART_WIDTH_PX rows however long the range is.
+    window = pick_window_seconds(range_seconds(start_range))
     try:
-        requests.post(DISCORD_WEBHOOK, json=message)
-    except:
-        pass
-
-# --- Dashboard Tabs ---
-tabs = st.tabs(["Overview", "Live Stream", "Manual Entry", "Metrics & Alerts", "Historical Data"])
-
-# Shared Logic
-if dashboard_choice == "DNS":
-    bucket = "realtime_dns"
-    measurement = "dns"
-    api_endpoint = "https://violabirech-dos-anomalies-detection.hf.space/predict/dns"
-    features = ["dns_rate", "inter_arrival_time"]
-elif dashboard_choice == "DoS":
-    bucket = "realtime"
-    measurement = "network_traffic"
-    api_endpoint = "https://violabirech-dos-anomalies-detection.hf.space/predict/dos"
-    features = ["packet_rate", "packet_length", "inter_arrival_time"]
+        return _fetch_influx_aggregated(schema.kind, start_range, window, fn)
+    except Exception as e:
+        st.error(f"InfluxDB error: {e}")
+        return pd.DataFrame()
+
+def iter_influx(start_range="-1h"):
+    # Uncached chunked read for consumers that aggregate as they go (bounded memory).
+    try:
+        yield from get_source(schema.kind).iter_chunks(start_range)
+    except Exception as e:
+        st.error(f"InfluxDB error: {e}")
+
+# --- Anomaly Detection ---
+# Same process-wide scorer and prediction cache as the tabs app and the worker
+try:
+    scorer = get_scorer(schema, BACKEND_LABELS[scoring_backend], PREDICT_API_URL, MODEL_VERSION, PREDICTION_CACHE_DB)
+except FileNotFoundError as e:
+    st.error(f"Local model unavailable ({e}); scoring with the remote API instead.")
+    scorer = get_scorer(schema, "remote", PREDICT_API_URL, MODEL_VERSION, PREDICTION_CACHE_DB)
+
+@traced("detect_anomalies")
+def detect_anomalies(df, pipeline=None):
+    # Rolling features first: a fresh pipeline recomputes over df, a carried one continues its stream
+    if scorer.derived_features:
+        df = (pipeline or FeaturePipeline(features)).transform(df)
+    if df.empty:
+        return df.assign(anomaly=pd.Series(dtype="int8"), reconstruction_error=pd.Series(dtype=float))
+    return scorer.score_frame(df)[0]
+
+# --- Discord Alert ---
+# Queued only: the dispatcher coalesces, rate-limits and posts in the background
+alert_sink = AlertSink(get_dispatcher(DISCORD_WEBHOOK), schema)
+
+# --- Dashboard Views ---
+# Only the selected view runs: st.tabs would fetch and score every tab's window on each rerun.
+view = st.radio("View", ["Overview", "Live Stream", "Manual Entry", "Metrics & Alerts", "Historical Data"],
+                horizontal=True, key="view", label_visibility="collapsed")
 
 # --- Overview Tab ---
-with tabs[0]:
+if view == "Overview":
     st.header(f"{dashboard_choice} Overview")
-    df = query_influx(bucket, measurement, features, start_range=time_range_query_map[time_range])
-    if not df.empty:
-        df = detect_anomalies(api_endpoint, df, features)
-        st.metric("Total Records", len(df))
-        st.metric("Anomaly Rate", f"{df['anomaly'].mean():.2%}")
-        st.dataframe(df.tail(50))
+    total, anomalies, recent = 0, 0, None
+    pipeline = FeaturePipeline(features)  # carried across chunks, same columns as one pass
+    for chunk in iter_influx(start_range=time_range_query_map[time_range]):
+        chunk = detect_anomalies(chunk, pipeline)
+        total += len(chunk)
+        anomalies += int(chunk["anomaly"].sum())
+        recent = chunk.tail(50) if recent is None else pd.concat([recent, chunk]).tail(50)
+    if total:
+        st.metric("Total Records", total)
+        st.metric("Anomaly Rate", f"{anomalies / total:.2%}")
+        st.dataframe(recent)
 
 # --- Live Stream ---
-with tabs[1]:
+LIVE_ROWS = 500
+
+if view == "Live Stream":
     st_autorefresh(interval=10000, key="live_refresh")
     st.subheader("Live Stream (Refreshes every 10s)")
-    df = query_influx(bucket, measurement, features, start_range="-30s")
-    df = detect_anomalies(api_endpoint, df, features)
-    if alerts_enabled and (df["anomaly"] == 1).any():
-        send_discord_alert(df[df["anomaly"] == 1].iloc[-1], typ=dashboard_choice)
-        st.warning("🚨 Anomaly Detected!")
-    st.dataframe(df)
+    cursors = st.session_state.setdefault("tail_cursors", {})
+    cursor = cursors.setdefault(schema.kind, TailCursor(initial_range="-30s"))
+    pipelines = st.session_state.setdefault("feature_pipelines", {})
+    pipeline = pipelines.setdefault(schema.kind, FeaturePipeline(features))
+    # Same tail read as tabs/live_stream.py: rows carry their series, so same-time points of
+    # different series are neither dropped by the dedup nor cut off by a row limit
+    try:
+        chunks = list(get_source(schema.kind).tail(cursor))
+    except Exception as e:
+        st.error(f"InfluxDB error: {e}")
+        chunks = []
+    live_rows = st.session_state.setdefault("live_rows", {})
+    key = schema.kind
+    new_rows = 0
+    if chunks:
+        scored = detect_anomalies(pd.concat(chunks, ignore_index=True), pipeline)
+        if alerts_enabled and (scored["anomaly"] == 1).any():
+            alert_sink.write(scored)
+            st.warning("🚨 Anomaly Detected!")
+        live_rows[key] = pd.concat([live_rows.get(key, scored.iloc[0:0]), scored]).tail(LIVE_ROWS)
+        new_rows = len(scored)
+    st.caption(f"{new_rows} new rows this refresh")
+    st.dataframe(live_rows.get(key, pd.DataFrame()))
 
 # --- Manual Entry ---
-with tabs[2]:
+if view == "Manual Entry":
     st.subheader("Manual Entry")
     inputs = {f: st.number_input(f, min_value=0.0, value=1.0) for f in features}
     if st.button("Submit for Prediction"):
-        try:
-            res = requests.post(api_endpoint, json=inputs).json()
-            st.success(f"Prediction: {'Anomaly' if res['anomaly'] else 'Normal'} - Score: {res.get('anomaly_score', res.get('reconstruction_error', 0.0))}")
-        except:
+        frame = pd.DataFrame([inputs]).assign(timestamp=utc_now())
+        if scorer.derived_features:
+            frame = add_features(frame, features)
+        result, ok = scorer.score_frame(frame)
+        if ok.all():
+            row = result.iloc[0]
+            st.success(f"Prediction: {'Anomaly' if row['anomaly'] else 'Normal'} - Score: {row['reconstruction_error']}")
+        else:
             st.error("API call failed.")
 
 # --- Metrics & Alerts ---
-with tabs[3]:
+if view == "Metrics & Alerts":
+    import plotly.express as px
+
     st.subheader("Metrics & Alerts")
-    df = query_influx(bucket, measurement, features, start_range=time_range_query_map[time_range])
-    df = detect_anomalies(api_endpoint, df, features)
+    df = detect_anomalies(query_influx(start_range=time_range_query_map[time_range]))
     if not df.empty:
-        pie = px.pie(df, names=df["anomaly"].map({0: "Normal", 1: "Attack"}), title="Anomaly Distribution")
-        line = px.line(df, x="timestamp", y="score", title="Anomaly Score Over Time")
+        attacks = int(df["anomaly"].sum())
+        pie = px.pie(names=["Normal", "Attack"], values=[len(df) - attacks, attacks], title="Anomaly Distribution")
+        window = pick_window_seconds(range_seconds(time_range_query_map[time_range]))
+        scores = aggregate_scores(df, window, score_col="reconstruction_error")
+        line = px.line(scores, x="timestamp", y=["mean_score", "max_score"], title="Anomaly Score Over Time",
+                       hover_data=["anomalies", "count"])
         st.plotly_chart(pie)
         st.plotly_chart(line)
 
 # --- Historical Data ---
-with tabs[4]:
+if view == "Historical Data":
+    import plotly.express as px
+
     st.subheader("Historical Trends")
-    df = query_influx(bucket, measurement, features, start_range=time_range_query_map[time_range])
-    df = detect_anomalies(api_endpoint, df, features)
-    if not df.empty:
-        fig = px.line(df, x="timestamp", y=features, color=df["anomaly"].map({0: "Normal", 1: "Anomaly"}), title="Traffic Trends")
+    start_range = time_range_query_map[time_range]
+    trend = query_influx_aggregated(start_range=start_range)
+    df = detect_anomalies(query_influx(start_range=start_range))
+    if not trend.empty:
+        fig = px.line(trend, x="timestamp", y=features, title="Traffic Trends")
+        if not df.empty:
+            flagged = lttb_frame(df[df["anomaly"] == 1], "timestamp", features[0])
+            fig.add_scatter(x=flagged["timestamp"], y=flagged[features[0]], mode="markers",
+                            marker_color=highlight_color, name="Anomaly")
         st.plotly_chart(fig)
+
+# --- Prediction Cache Stats ---
+cache_stats = get_cache(PREDICTION_CACHE_DB).stats()
+st.sidebar.markdown("**Prediction Cache**")
+st.sidebar.caption(
+    f"Hits: {cache_stats['hits']} (disk: {cache_stats['disk_hits']}) · "
+    f"Misses: {cache_stats['misses']} · Hit rate: {cache_stats['hit_rate']:.1%}"
+)
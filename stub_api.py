@@ -0,0 +1,97 @@
+# --- Local stand-in for the prediction API ---
+# Mirrors the /predict/{dns,dos} routes of the HF Space plus the columnar
+# /predict/{dns,dos}/batch contract used by core/inference.py.
+# Run with: uvicorn stub_api:app --port 8000
+# and set PREDICT_API_URL = "http://localhost:8000" in .streamlit/secrets.toml.
+# POST /webhook stands in for the Discord webhook (with Discord-style 429s).
+# When models/{dns,dos}_model.joblib exist they are served instead of the toy
+# rule, through the same code path as the local backend.
+import os
+import time
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from core.local_scorer import MODEL_PATHS, load_model, score_frame_local
+from core.schemas import SCHEMAS
+
+app = FastAPI(title="Anomaly Detection API (local stand-in)")
+
+FEATURES = {kind: list(schema.features) for kind, schema in SCHEMAS.items()}
+THRESHOLD = 0.5
+MODELS = {kind: load_model(path) for kind, path in MODEL_PATHS.items() if os.path.exists(path)}
+
+
+class BatchRequest(BaseModel):
+    columns: Dict[str, List[float]]
+
+
+def _score(kind, columns):
+    if kind in MODELS:
+        anomaly, score, _ = score_frame_local(MODELS[kind], pd.DataFrame(columns), FEATURES[kind])
+        return anomaly.astype(int), score
+    # Deterministic toy model: high rates and short inter-arrival times look like attacks.
+    iat = np.asarray(columns["inter_arrival_time"], dtype=float)
+    if kind == "dns":
+        rate = np.asarray(columns["dns_rate"], dtype=float) / 100.0
+    else:
+        rate = np.asarray(columns["packet_rate"], dtype=float) / 1000.0
+        rate = rate * np.clip(np.asarray(columns["packet_length"], dtype=float) / 1500.0, 0.1, 1.0)
+    score = np.clip(rate + np.clip(0.01 - iat, 0.0, 0.01) * 10, 0.0, 1.0)
+    return (score > THRESHOLD).astype(int), score
+
+
+def _check(kind, columns):
+    if kind not in FEATURES:
+        raise HTTPException(status_code=404, detail=f"Unknown model '{kind}'")
+    missing = [f for f in FEATURES[kind] if f not in columns]
+    if missing:
+        raise HTTPException(status_code=422, detail=f"Missing features: {missing}")
+
+
+@app.post("/predict/{kind}")
+def predict(kind: str, row: Dict[str, float]):
+    _check(kind, row)
+    anomaly, score = _score(kind, {f: [row[f]] for f in FEATURES[kind]})
+    return {"anomaly": int(anomaly[0]), "reconstruction_error": float(score[0])}
+
+
+@app.post("/predict/{kind}/batch")
+def predict_batch(kind: str, request: BatchRequest):
+    _check(kind, request.columns)
+    anomaly, score = _score(kind, request.columns)
+    return {"anomaly": anomaly.tolist(), "reconstruction_error": score.tolist()}
+
+
+# --- Webhook stand-in ---
+WEBHOOK_RATE_LIMIT = 5       # messages
+WEBHOOK_RATE_PERIOD = 2.0    # seconds
+webhook_messages = []
+_webhook_sent_at = []
+
+
+@app.post("/webhook")
+def webhook(message: Dict[str, object]):
+    now = time.monotonic()
+    _webhook_sent_at[:] = [t for t in _webhook_sent_at if now - t < WEBHOOK_RATE_PERIOD]
+    if len(_webhook_sent_at) >= WEBHOOK_RATE_LIMIT:
+        retry_after = WEBHOOK_RATE_PERIOD - (now - _webhook_sent_at[0])
+        return JSONResponse(status_code=429, content={
+            "message": "You are being rate limited.", "retry_after": round(retry_after, 3), "global": False,
+        })
+    _webhook_sent_at.append(now)
+    webhook_messages.append(message)
+    return Response(status_code=204)
+
+
+@app.get("/webhook/messages")
+def list_webhook_messages():
+    return webhook_messages
+
+
+@app.delete("/webhook/messages")
+def clear_webhook_messages():
+    webhook_messages.clear()
+    return {"cleared": True}
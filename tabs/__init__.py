@@ -0,0 +1,120 @@
+import pandas as pd
+import streamlit as st
+from datetime import datetime, timedelta
+from core import InfluxSource, get_influx_client, get_schema, get_scorer, get_store
+from core.config import DATABASE_PATH, DEFAULT_API_URL, DEFAULT_MODEL_VERSION, INGEST_WORKER_NAME
+from core.export import export_range
+from core.pipeline import LATENCY_BUDGET
+from core.retention import rollup_series, rollup_summary, start_rollup_worker
+from core.scoring import BACKEND_LABELS
+from core.store import utc_now
+from tabs.paging import get_pager
+
+def get_influx_source(type: str = "dns") -> InfluxSource:
+    client = get_influx_client(st.secrets["INFLUXDB_URL"], st.secrets["INFLUXDB_TOKEN"], st.secrets["INFLUXDB_ORG"])
+    return InfluxSource(client, get_schema(type))
+
+def get_tab_scorer(type: str = "dns", scoring_backend: str = "Remote API"):
+    # Shared per process with liveapp.py: same HTTP pool, models and prediction cache
+    settings = (st.secrets.get("PREDICT_API_URL", DEFAULT_API_URL),
+                st.secrets.get("MODEL_VERSION", DEFAULT_MODEL_VERSION),
+                st.secrets.get("PREDICTION_CACHE_DB"))
+    try:
+        return get_scorer(get_schema(type), BACKEND_LABELS[scoring_backend], *settings, budget=LATENCY_BUDGET)
+    except FileNotFoundError as e:
+        st.error(f"Local model unavailable ({e}); scoring with the remote API instead.")
+        return get_scorer(get_schema(type), "remote", *settings, budget=LATENCY_BUDGET)
+
+def load_predictions_from_sqlitecloud(type: str = "dns", time_window: str = "-24h") -> pd.DataFrame:
+    try:
+        # Uses the timestamp index: timestamp >= start
+        return get_store(DATABASE_PATH).read_range(type, start=_window_start(time_window), order="DESC")
+    except Exception as e:
+        print(f"Error loading predictions: {e}")
+        return pd.DataFrame()
+
+def log_predictions_to_sqlitecloud(type: str, records) -> int:
+    # One executemany transaction per refresh instead of one connection per row
+    try:
+        return get_store(DATABASE_PATH).insert_many(type, records)
+    except Exception as e:
+        print(f"Error logging predictions: {e}")
+        return 0
+
+def ingest_worker_running() -> bool:
+    try:
+        return get_store(DATABASE_PATH).worker_alive(INGEST_WORKER_NAME)
+    except Exception as e:
+        print(f"Error reading worker status: {e}")
+        return False
+
+def load_latest_predictions(type: str = "dns", limit: int = 1000) -> pd.DataFrame:
+    # Read-only view of what worker.py has scored, shaped like the live session predictions
+    try:
+        df = get_store(DATABASE_PATH).read_latest(type, limit=limit)
+        df["anomaly"] = df["is_anomaly"]
+        df["label"] = df["anomaly"].map({0: "Normal", 1: "Attack"})
+        return df
+    except Exception as e:
+        print(f"Error loading latest predictions: {e}")
+        return pd.DataFrame()
+
+def get_prediction_pager(type: str = "dns", start_date=None, end_date=None, order: str = "ASC"):
+    # Table pages straight from SQLite (LIMIT/OFFSET or keyset on timestamp)
+    return get_pager(get_store(DATABASE_PATH), type, start_date, end_date, order)
+
+def _window_start(time_window: str) -> datetime:
+    # Convert time_window like '-24h' or '-7d' into actual datetime
+    now = utc_now()  # stored timestamps are naive UTC
+    if time_window.endswith("h"):
+        hours = int(time_window.strip("-h"))
+        return now - timedelta(hours=hours)
+    elif time_window.endswith("d"):
+        days = int(time_window.strip("-d"))
+        return now - timedelta(days=days)
+    elif time_window.endswith("m"):
+        minutes = int(time_window.strip("-m"))
+        return now - timedelta(minutes=minutes)
+    return now - timedelta(days=1)  # default fallback to 1 day
+
+def load_prediction_summary(type: str = "dns", time_window: str = "-24h") -> dict:
+    # Constant-time Overview metrics from the minute/hour rollups instead of scanning raw rows
+    try:
+        store = get_store(DATABASE_PATH)
+        start_rollup_worker(store)
+        return rollup_summary(store, type, _window_start(time_window))
+    except Exception as e:
+        print(f"Error loading prediction summary: {e}")
+        return {"total": 0, "anomalies": 0, "recent_attacks": 0}
+
+def load_prediction_buckets(type: str = "dns", time_window: str = "-24h", bucket_seconds: int = 60) -> pd.DataFrame:
+    # Chart series re-bucketed from the rollups: one row per bucket (mean/max score, anomaly count)
+    try:
+        store = get_store(DATABASE_PATH)
+        start_rollup_worker(store)
+        return rollup_series(store, type, _window_start(time_window), bucket_seconds)
+    except Exception as e:
+        print(f"Error loading prediction buckets: {e}")
+        return pd.DataFrame()
+
+def export_predictions(type: str, start_date, end_date, fmt: str = "CSV") -> str | None:
+    # Built on demand and reused until rows in the range change
+    try:
+        return export_range(get_store(DATABASE_PATH), type, start_date, end_date, fmt)
+    except Exception as e:
+        print(f"Error exporting predictions: {e}")
+        return None
+
+def get_historical_dns(start_date, end_date, columns: str = "*") -> pd.DataFrame:
+    return _get_data_by_date_range("dns", start_date, end_date, columns)
+
+def get_historical_dos(start_date, end_date, columns: str = "*") -> pd.DataFrame:
+    return _get_data_by_date_range("dos", start_date, end_date, columns)
+
+def _get_data_by_date_range(type: str, start_date, end_date, columns: str = "*") -> pd.DataFrame:
+    try:
+        # start_date <= timestamp < end_date + 1 day, instead of DATE(timestamp) BETWEEN which skips the index
+        return get_store(DATABASE_PATH).read_range(type, start=start_date, end=end_date, columns=columns)
+    except Exception as e:
+        print(f"Error retrieving historical data: {e}")
+        return pd.DataFrame()
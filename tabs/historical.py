@@ -0,0 +1,131 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from datetime import timedelta
+from tabs import get_historical_dns, get_historical_dos, get_prediction_pager, export_predictions
+from core.export import EXPORT_FORMATS
+from core.schemas import DNS, DOS
+from core.store import utc_now
+from tabs.paging import highlight_rows, page_selector
+from tabs.score_index import ScoreIndex, auc
+from core.downsample import CHART_WIDTH_PX, lttb_frame
+from core.telemetry import traced
+
+HISTORICAL_SOURCES = {
+    DNS.label: (get_historical_dns, DNS.features[0]),
+    DOS.label: (get_historical_dos, DOS.features[0]),
+}
+
+
+def _read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@st.cache_resource(ttl=60, max_entries=4)
+def load_window(traffic_type, start_date, end_date):
+    # Loaded and indexed once per window; slider moves only query the index.
+    # Shared across reruns, so callers must not modify the frame.
+    # Only what the index and charts need; the table and exports page the full rows from the store.
+    fetch, value_col = HISTORICAL_SOURCES[traffic_type]
+    df = fetch(start_date, end_date, columns=f"timestamp, {value_col}, anomaly_score, reconstruction_error, is_attack")
+    if df.empty:
+        return df, None, None
+    score = df["anomaly_score"].fillna(df["reconstruction_error"])
+    labels = df["is_attack"] if "is_attack" in df else None
+    trend = lttb_frame(df, "timestamp", value_col)  # threshold-independent, so computed once
+    return df.assign(reconstruction_error=score), ScoreIndex(score.to_numpy(), labels), trend
+
+
+@traced("render.historical")
+def render(thresh, highlight_color, traffic_type="DNS"):
+    st.header(f"Historical {traffic_type} Data")
+    value_col = HISTORICAL_SOURCES[traffic_type][1]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("Start Date", utc_now() - timedelta(days=7))
+    with col2:
+        end_date = st.date_input("End Date", utc_now())
+
+    df, index, trend = load_window(traffic_type, start_date, end_date)
+    if not df.empty:
+        anomalies = index.count_above(thresh)
+
+        st.subheader("Summary")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Total Records", len(index))
+        col2.metric("Anomalies Detected", anomalies)
+        col3.metric("Anomaly Rate", f"{index.rate_above(thresh):.2%}")
+
+        chart_type = st.selectbox("Chart Type", ["Line", "Bar", "Pie", "Area", "Scatter"], index=0)
+
+        pager = get_prediction_pager(traffic_type.lower(), start_date, end_date)
+        page = page_selector(len(index), key="hist_page", label="Historical Page")
+        df_view = pager.page(page)
+        df_view["reconstruction_error"] = df_view["anomaly_score"].fillna(df_view["reconstruction_error"])
+        df_view["anomaly"] = (df_view["reconstruction_error"] > thresh).astype(int)
+        st.dataframe(highlight_rows(df_view, df_view["anomaly"] == 1, highlight_color))
+
+        # Cached trend of every row, overlaid with the rows flagged at this threshold
+        # (taken straight from the index, then downsampled so attacks survive)
+        flagged = df.iloc[index.rows_above(thresh)].sort_values("timestamp")
+        parts = [trend.assign(label="Normal")]
+        if not flagged.empty:
+            parts.append(lttb_frame(flagged, "timestamp", value_col).assign(label="Attack"))
+        df_chart = pd.concat(parts, ignore_index=True)
+
+        if chart_type == "Line":
+            chart = px.line(df_chart, x="timestamp", y=value_col, color="label",
+                            color_discrete_map={"Normal": "blue", "Attack": "red"})
+        elif chart_type == "Bar":
+            chart = px.bar(df_chart, x="timestamp", y=value_col, color="label",
+                           color_discrete_map={"Normal": "blue", "Attack": "red"})
+        elif chart_type == "Pie":
+            chart = px.pie(names=["Normal", "Attack"], values=[len(index) - anomalies, anomalies])
+        elif chart_type == "Area":
+            chart = px.area(df_chart, x="timestamp", y=value_col, color="label",
+                            color_discrete_map={"Normal": "blue", "Attack": "red"})
+        elif chart_type == "Scatter":
+            chart = px.scatter(df_chart, x="timestamp", y=value_col, color="label",
+                               color_discrete_map={"Normal": "blue", "Attack": "red"})
+
+        st.plotly_chart(chart, use_container_width=True)
+
+        # --- Threshold What-If ---
+        curve = index.sweep()
+        curve_view = curve.iloc[::max(len(curve) // CHART_WIDTH_PX, 1)]  # one point per pixel is plenty
+        st.subheader("Threshold Sweep")
+        if index.has_labels:
+            tn, fp, fn, tp = index.confusion_at(thresh).ravel()
+            col1, col2 = st.columns(2)
+            col1.metric("Precision", f"{tp / (tp + fp) if tp + fp else 0.0:.2%}")
+            col2.metric("Recall", f"{tp / (tp + fn) if tp + fn else 0.0:.2%}")
+            col1, col2 = st.columns(2)
+            with col1:
+                fig_pr = px.line(curve_view, x="recall", y="precision", title="Precision-Recall")
+                st.plotly_chart(fig_pr, use_container_width=True)
+            with col2:
+                fig_roc = px.line(curve_view, x="fpr", y="recall", title=f"ROC (AUC {auc(curve['fpr'], curve['recall']):.3f})",
+                                  labels={"fpr": "False Positive Rate", "recall": "True Positive Rate"})
+                st.plotly_chart(fig_roc, use_container_width=True)
+        else:
+            fig_sweep = px.line(curve_view, x="threshold", y="flagged", title="Rows Flagged by Threshold")
+            fig_sweep.add_vline(x=thresh, line_dash="dash", line_color="black", annotation_text="Threshold")
+            st.plotly_chart(fig_sweep, use_container_width=True)
+            st.caption("Precision/recall need stored `is_attack` labels.")
+
+        # --- Export ---
+        # Nothing is serialized until asked for; the file is streamed from the store and cached per range.
+        fmt = st.radio("Export Format", list(EXPORT_FORMATS), horizontal=True, key="hist_export_format")
+        export_key = (traffic_type, str(start_date), str(end_date), fmt)
+        if st.button("Prepare Download"):
+            st.session_state["hist_export"] = (export_key, export_predictions(traffic_type.lower(), start_date, end_date, fmt))
+        prepared_key, path = st.session_state.get("hist_export", (None, None))
+        if prepared_key == export_key and path:
+            extension, mime = EXPORT_FORMATS[fmt]
+            # A callable is only run when the button is clicked, so reruns never read the file
+            st.download_button(f"Download {fmt}", lambda: _read_file(path), mime=mime,
+                               file_name=f"historical_{traffic_type.lower()}_{start_date}_{end_date}.{extension}")
+    else:
+        st.warning("No historical data found.")
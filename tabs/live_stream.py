@@ -0,0 +1,71 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+from streamlit_autorefresh import st_autorefresh
+from tabs import get_influx_source, get_tab_scorer, get_prediction_pager, ingest_worker_running
+from tabs.paging import PAGE_ROWS, highlight_rows, page_selector
+from tabs.ring_buffer import get_live_buffer
+from core import AlertSink, BackgroundSink, FeaturePipeline, StoreSink, get_schema, get_store, write_all
+from core.alerts import get_dispatcher
+from core.config import DATABASE_PATH
+from core.influx_tail import TailCursor
+from core.telemetry import traced
+
+@traced("render.live_stream")
+def render(thresh, highlight_color, alerts_enabled, traffic_type, scoring_backend="Remote API"):
+    st_autorefresh(interval=10000, key="live_refresh")
+    st.header("📡 Live Stream Anomaly Detection")
+
+    data_type = st.radio("Select Data Type", ["DNS", "DoS"], horizontal=True)
+
+    # When worker.py is running it owns fetching, scoring, alerting and logging;
+    # this tab only reads its output, so N viewers cost the same as one.
+    worker_active = ingest_worker_running()
+    if worker_active:
+        st.caption("Scored by the background worker (read-only view).")
+
+    if not worker_active:
+        schema = get_schema(data_type)
+        cursors = st.session_state.setdefault("live_cursors", {})
+        cursor = cursors.setdefault(data_type, TailCursor(initial_range="-30s"))
+        # Rolling-feature state advances with the cursor, so each refresh only computes new rows
+        pipelines = st.session_state.setdefault("live_feature_pipelines", {})
+        pipeline = pipelines.setdefault(data_type, FeaturePipeline(schema.features))
+        try:
+            chunks = list(get_influx_source(data_type).tail(cursor))
+        except Exception as e:
+            st.error(f"InfluxDB error: {e}")
+            chunks = []
+
+        if chunks:
+            scorer = get_tab_scorer(data_type, scoring_backend)
+            new_rows = pd.concat(chunks, ignore_index=True)
+            if scorer.derived_features:
+                new_rows = pipeline.transform(new_rows)
+            scored, ok = scorer.score_frame(new_rows)
+            if not ok.all():
+                st.warning(f"Scoring failed for {int((~ok).sum())} of {len(ok)} records.")
+            scored = scored[ok]
+
+            # Appended in place into the fixed-capacity columnar buffer; store and alerts in the background
+            get_live_buffer(data_type).append(scored)
+            sinks = [BackgroundSink(StoreSink(get_store(DATABASE_PATH), schema))]
+            if alerts_enabled:
+                sinks.append(AlertSink(get_dispatcher(st.secrets.get("DISCORD_WEBHOOK")), schema))
+            write_all(sinks, scored)
+
+    if worker_active:
+        # Newest first, one page per query against the store
+        pager = get_prediction_pager(data_type.lower(), order="DESC")
+        page_number = page_selector(pager.count(), key="live_page")
+        paged_df = pager.page(page_number)
+        paged_df["anomaly"] = paged_df["is_anomaly"]
+    else:
+        buffer = get_live_buffer(data_type)
+        page_number = page_selector(len(buffer), key="live_page")
+        paged_df = buffer.frame().iloc[page_number * PAGE_ROWS:(page_number + 1) * PAGE_ROWS]  # views, no copy
+    if not paged_df.empty:
+        paged_df = paged_df.assign(label=np.where(paged_df["anomaly"] == 1, "Attack", "Normal"))
+        st.dataframe(highlight_rows(paged_df, paged_df["anomaly"] == 1, highlight_color), key="live_table")
+    else:
+        st.info(f"No {data_type} predictions yet.")
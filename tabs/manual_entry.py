@@ -1,19 +1,29 @@
-from utils import log_to_sqlitecloud
-# some logic
 import streamlit as st
 import pandas as pd
-import requests
-from datetime import datetime
-from tabs.utils import API_URL_DNS, API_URL_DOS  # Define both endpoints or use a dynamic switch
+from tabs import get_tab_scorer
+from tabs.ring_buffer import get_live_buffer
+from core import add_features, get_schema
+from core.store import utc_now
+from core.telemetry import traced
 
-def render(traffic_type):
+def predict_manual(data_type, inputs, scoring_backend="Remote API"):
+    # Same scorer (and prediction cache) as the live stream
+    scorer = get_tab_scorer(data_type, scoring_backend)
+    frame = pd.DataFrame([inputs]).assign(timestamp=utc_now())
+    if scorer.derived_features:
+        # A lone row has no history: its rolling features are the row itself
+        frame = add_features(frame, get_schema(data_type).features)
+    scored, ok = scorer.score_frame(frame)
+    if not ok.all():
+        raise RuntimeError("prediction API call failed")
+    get_live_buffer(data_type).append(scored)
+
+@traced("render.manual_entry")
+def render(traffic_type, scoring_backend="Remote API"):
     st.header("Manual Anomaly Prediction")
 
     data_type = st.selectbox("Select Data Type", ["DNS", "DoS"], index=0)
 
-    if "predictions" not in st.session_state:
-        st.session_state.predictions = []
-
     if data_type == "DNS":
         col1, col2 = st.columns(2)
         with col1:
@@ -23,14 +33,11 @@ def render(traffic_type):
 
         if st.button("Predict DNS"):
             try:
-                res = requests.post(API_URL_DNS, json={
+                inputs = {
                     "inter_arrival_time": inter_arrival_time,
                     "dns_rate": dns_rate
-                })
-                result = res.json()
-                result["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                result["label"] = "Attack" if result["anomaly"] == 1 else "Normal"
-                st.session_state.predictions.append(result)
+                }
+                predict_manual("DNS", inputs, scoring_backend)
                 st.success("Prediction successful!")
             except Exception as e:
                 st.error(f"DNS Prediction Error: {e}")
@@ -46,19 +53,18 @@ def render(traffic_type):
 
         if st.button("Predict DoS"):
             try:
-                res = requests.post(API_URL_DOS, json={
+                inputs = {
                     "packet_rate": packet_rate,
                     "packet_length": packet_length,
                     "inter_arrival_time": inter_arrival_time
-                })
-                result = res.json()
-                result["timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                result["label"] = "Attack" if result["anomaly"] == 1 else "Normal"
-                st.session_state.predictions.append(result)
+                }
+                predict_manual("DoS", inputs, scoring_backend)
                 st.success("Prediction successful!")
             except Exception as e:
                 st.error(f"DoS Prediction Error: {e}")
 
-    if st.session_state.predictions:
+    buffer = get_live_buffer(data_type)
+    if len(buffer):
         st.subheader("Prediction Results")
-        st.dataframe(pd.DataFrame(st.session_state.predictions[::-1]))  # Most recent first
+        results = buffer.frame().iloc[::-1]  # Most recent first
+        st.dataframe(results.assign(label=results["anomaly"].map({0: "Normal", 1: "Attack"})))
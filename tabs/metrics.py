@@ -0,0 +1,83 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from tabs.ring_buffer import LIVE_SCHEMAS, GROUND_TRUTH_FIELD, get_live_buffer
+from tabs.online_metrics import OnlineMetrics, scores
+from core.telemetry import traced
+
+def get_metrics_engine(data_type):
+    engines = st.session_state.setdefault("metrics_engines", {})
+    if data_type not in engines:
+        engines[data_type] = OnlineMetrics()
+    return engines[data_type]
+
+@traced("render.metrics")
+def render(thresh, traffic_type):
+    st.header("📊 Model Performance Metrics")
+
+    # Ensure there's prediction history
+    data_types = [t for t in LIVE_SCHEMAS if get_live_buffer(t).total]
+    if not data_types:
+        st.info("No predictions available for performance analysis.")
+        return
+
+    # Let user select data type (DNS or DoS)
+    selected_type = st.selectbox("Select Data Type", data_types)
+    engine = get_metrics_engine(selected_type)
+    engine.consume(get_live_buffer(selected_type), truth_col=GROUND_TRUTH_FIELD)  # O(new rows)
+
+    st.subheader("Performance Metrics")
+    cm = engine.confusion_at(thresh)
+    if engine.labelled() >= 2 and cm.sum(axis=1).min() > 0:
+        result = scores(cm)
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Accuracy", f"{result['accuracy']:.2%}")
+        col2.metric("Precision", f"{result['precision']:.2%}")
+        col3.metric("Recall", f"{result['recall']:.2%}")
+        col4.metric("F1-Score", f"{result['f1']:.2%}")
+        st.caption(f"At threshold {thresh:.2f} over {engine.labelled()} labelled rows; "
+                   f"model's own flags: {scores(engine.model_confusion())['accuracy']:.2%} accuracy.")
+
+        # px.imshow instead of figure_factory.create_annotated_heatmap, which plotly 7 removed
+        fig_cm = px.imshow(
+            cm,
+            x=["Predicted Normal", "Predicted Attack"],
+            y=["Actual Normal", "Actual Attack"],
+            text_auto=True,
+            color_continuous_scale="Blues"
+        )
+        fig_cm.update_layout(title="Confusion Matrix", width=400, height=400)
+        st.plotly_chart(fig_cm)
+
+        # Whole threshold sweep in one pass over the histogram
+        curve = engine.sweep()
+        current = curve.iloc[(curve["threshold"] - thresh).abs().argmin()]
+        col1, col2 = st.columns(2)
+        with col1:
+            fig_pr = px.line(curve, x="recall", y="precision", title="Precision-Recall", hover_data=["threshold"])
+            fig_pr.add_scatter(x=[current["recall"]], y=[current["precision"]], mode="markers", name="Threshold")
+            st.plotly_chart(fig_pr, use_container_width=True)
+        with col2:
+            fig_roc = px.line(curve, x="fpr", y="recall", title="ROC", hover_data=["threshold"],
+                              labels={"fpr": "False Positive Rate", "recall": "True Positive Rate"})
+            fig_roc.add_scatter(x=[current["fpr"]], y=[current["recall"]], mode="markers", name="Threshold")
+            st.plotly_chart(fig_roc, use_container_width=True)
+    else:
+        st.warning(f"Metrics need ground-truth `{GROUND_TRUTH_FIELD}` labels for both classes.")
+
+    st.subheader("Reconstruction Error Distribution")
+    left_edges, counts = engine.histogram()
+    hist_df = pd.DataFrame({"reconstruction_error": left_edges, **counts}).melt(
+        id_vars="reconstruction_error", var_name="actual", value_name="count")
+    fig_hist = px.bar(
+        hist_df[hist_df["count"] > 0],
+        x="reconstruction_error",
+        y="count",
+        color="actual",
+        title="Reconstruction Error Distribution",
+        color_discrete_map={"Normal": "blue", "Attack": "red", "Unlabeled": "gray"},
+    )
+    fig_hist.update_traces(width=left_edges[1] - left_edges[0])
+    fig_hist.add_vline(x=thresh, line_dash="dash", line_color="black", annotation_text="Threshold")
+    st.plotly_chart(fig_hist, use_container_width=True)
+    st.caption(f"Median error ≈ {engine.quantile(0.5):.3f}, p95 ≈ {engine.quantile(0.95):.3f}")
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+# --- Streaming Metrics ---
+# Running confusion counts against ground-truth labels plus a fixed-bin
+# histogram of reconstruction_error per ground-truth class. Every update
+# costs O(new rows); metrics at any threshold come from the histogram.
+# Bin edges fall on the slider's 0.01 steps and bins are closed on the right,
+# so threshold counts are exact for `error > threshold`, the rule ScoreIndex
+# and the models use (a score equal to the threshold is not flagged).
+
+HIST_RANGE = (0.0, 1.0)
+HIST_BINS = 200
+CLASSES = ("Normal", "Attack", "Unlabeled")
+
+
+class OnlineMetrics:
+    def __init__(self, bins=HIST_BINS, value_range=HIST_RANGE):
+        self.edges = np.round(np.linspace(value_range[0], value_range[1], bins + 1), 10)
+        # Rows: ground truth 0 / 1 / unknown; columns: underflow, bins..., overflow
+        self.hist = np.zeros((len(CLASSES), bins + 2), dtype=np.int64)
+        self.model_counts = np.zeros(4, dtype=np.int64)  # tn, fp, fn, tp of the model's own flags
+        self.seen = 0  # ring-buffer `total` already consumed
+
+    def update(self, anomaly, error, actual):
+        """Fold a batch of rows in; `actual` is 0/1 ground truth or NaN when unknown."""
+        anomaly = np.asarray(anomaly, dtype=np.int64)
+        error = np.nan_to_num(np.asarray(error, dtype=float), nan=0.0)
+        actual = np.asarray(actual, dtype=float)
+        known = ~np.isnan(actual)
+        truth = np.where(known, actual, 2).astype(np.int64)
+
+        self.model_counts += np.bincount(truth[known] * 2 + anomaly[known], minlength=4)
+        slots = np.searchsorted(self.edges, error, side="left")  # 0 = underflow, bins + 1 = overflow
+        np.add.at(self.hist, (truth, slots), 1)
+
+    def consume(self, buffer, error_col="reconstruction_error", truth_col="is_attack"):
+        """Update from rows appended to a ColumnarRingBuffer since the last call."""
+        if buffer.total == self.seen:
+            return 0
+        new_rows = buffer.frame(since_total=self.seen)
+        self.update(new_rows["anomaly"], new_rows[error_col], new_rows[truth_col])
+        self.seen = buffer.total
+        return len(new_rows)
+
+    # --- Queries ---
+    def confusion_at(self, threshold):
+        """2x2 [[tn, fp], [fn, tp]] for `error > threshold`, from labelled rows only."""
+        cut = int(np.searchsorted(self.edges, threshold, side="left")) + 1
+        above = self.hist[:2, cut:].sum(axis=1)
+        below = self.hist[:2, :cut].sum(axis=1)
+        return np.array([[below[0], above[0]], [below[1], above[1]]])
+
+    def sweep(self):
+        """(threshold, precision, recall, fpr) at every bin edge, from suffix sums of the histogram."""
+        # above[:, i] = labelled rows with error > edges[i]
+        above = np.cumsum(self.hist[:2, ::-1], axis=1)[:, ::-1][:, 1:]
+        negatives, positives = self.hist[0].sum(), self.hist[1].sum()
+        fp, tp = above[0], above[1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return pd.DataFrame({
+                "threshold": self.edges,
+                "precision": np.where(tp + fp > 0, tp / (tp + fp), 1.0),
+                "recall": tp / positives if positives else np.zeros(len(tp)),
+                "fpr": fp / negatives if negatives else np.zeros(len(fp)),
+            })
+
+    def model_confusion(self):
+        return self.model_counts.reshape(2, 2)
+
+    def labelled(self):
+        return int(self.hist[:2].sum())
+
+    def quantile(self, q):
+        """Approximate quantile of reconstruction_error (bin upper edge)."""
+        counts = self.hist.sum(axis=0)
+        total = counts.sum()
+        if total == 0:
+            return float("nan")
+        slot = int(np.searchsorted(np.cumsum(counts), q * total, side="left"))
+        return float(self.edges[min(max(slot, 0), len(self.edges) - 1)])
+
+    def histogram(self):
+        """(bin left edges, counts per class) for the in-range bins."""
+        return self.edges[:-1], {name: self.hist[i, 1:-1] for i, name in enumerate(CLASSES)}
+
+
+def scores(cm):
+    tn, fp, fn, tp = (int(v) for v in cm.ravel())
+    total = tn + fp + fn + tp
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    return {
+        "accuracy": (tp + tn) / total if total else 0.0,
+        "precision": precision,
+        "recall": recall,
+        "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+    }
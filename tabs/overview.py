@@ -0,0 +1,40 @@
+import streamlit as st
+import plotly.express as px
+from streamlit_autorefresh import st_autorefresh
+from tabs import load_prediction_buckets, load_prediction_summary
+from core.downsample import range_seconds, pick_window_seconds
+from core.telemetry import traced
+
+@traced("render.overview")
+def render(time_range, time_range_query_map, traffic_type):
+    st_autorefresh(interval=30000, key="overview_refresh")
+
+    st.title("📈 Unified Anomaly Detection Overview")
+    data_type = st.radio("Select Data Type", ["DNS", "DoS"], horizontal=True)
+
+    query_duration = time_range_query_map.get(time_range, "-24h")
+    summary = load_prediction_summary(type=data_type.lower(), time_window=query_duration)
+
+    if summary["total"]:
+        total_predictions = summary["total"]
+        attack_rate = summary["anomalies"] / total_predictions
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Total Predictions", total_predictions)
+        col2.metric("Attack Rate", f"{attack_rate:.2%}")
+        col3.metric("Recent Attacks", summary["recent_attacks"])
+
+        # Chart reads pre-aggregated buckets sized to the chart width, not raw rows
+        bucket_seconds = pick_window_seconds(range_seconds(query_duration))
+        buckets = load_prediction_buckets(type=data_type.lower(), time_window=query_duration,
+                                          bucket_seconds=bucket_seconds)
+        fig = px.line(
+            buckets,
+            x="timestamp",
+            y=["mean_score", "max_score"],
+            hover_data=["anomalies", "count"],
+            title=f"{data_type} Anomaly Score Over Time"
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info(f"No {data_type} predictions available in the selected time range.")
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from core.store import format_timestamp
+
+# --- Paged Tables ---
+# Tables show one page at a time. Stored ranges are paged in SQLite rather
+# than loaded and sliced, and highlighting is a style frame built from one
+# boolean column instead of a Python call per row.
+
+PAGE_ROWS = 100
+
+
+def page_count(total, rows=PAGE_ROWS):
+    return max((total - 1) // rows + 1, 1)
+
+
+def page_selector(total, key, label="Page", rows=PAGE_ROWS):
+    """0-based page number from a number input sized for `total` rows."""
+    return st.number_input(label, min_value=1, max_value=page_count(total, rows), value=1, step=1, key=key) - 1
+
+
+def highlight_rows(df, mask, color):
+    """Styler filling the rows where `mask` is true with `color`."""
+    css = np.where(np.asarray(mask, dtype=bool), f"background-color: {color}", "")
+    styles = pd.DataFrame(np.repeat(css[:, None], df.shape[1], axis=1), index=df.index, columns=df.columns)
+    return df.style.apply(lambda _: styles, axis=None)
+
+
+class StorePager:
+    """Pages over a stored time range. Turning to the next page seeks past the
+    previous page's last key; jumps fall back to LIMIT/OFFSET."""
+
+    def __init__(self, store, kind, start=None, end=None, order="ASC", rows=PAGE_ROWS):
+        self.store = store
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.order = order
+        self.rows = rows
+        self._last_keys = {}  # page -> (timestamp text, id) of its last row
+
+    def count(self):
+        return self.store.count_range(self.kind, self.start, self.end)
+
+    def page(self, number):
+        after = self._last_keys.get(number - 1)
+        df = self.store.read_page(self.kind, self.start, self.end, limit=self.rows,
+                                  offset=number * self.rows, after=after, order=self.order)
+        if not df.empty:
+            last = df.iloc[-1]
+            self._last_keys[number] = (format_timestamp(last["timestamp"]), int(last["id"]))
+        return df
+
+
+def get_pager(store, kind, start=None, end=None, order="ASC"):
+    """Session-scoped pager per range, so its page keys survive reruns."""
+    pagers = st.session_state.setdefault("store_pagers", {})
+    key = (store.path, kind, str(start), str(end), order)
+    if key not in pagers:
+        pagers[key] = StorePager(store, kind, start, end, order)
+    return pagers[key]
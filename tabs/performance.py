@@ -0,0 +1,48 @@
+import time
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from core.telemetry import telemetry
+
+# Hidden tab: app.py only shows it when the URL has ?perf=1
+
+def render(metrics_port=None):
+    st.header("⏱ Performance")
+    st.caption(f"Process-wide since {pd.Timestamp(telemetry.started, unit='s'):%Y-%m-%d %H:%M:%S} UTC "
+               f"({time.time() - telemetry.started:,.0f}s); shared by every session of this server.")
+
+    counters = telemetry.counters
+    hit_rate = telemetry.hit_rate("prediction_cache")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Prediction Cache Hit Rate", f"{hit_rate:.1%}" if hit_rate is not None else "—")
+    col2.metric("Alerts Sent", counters.get("alerts.sent", 0))
+    col3.metric("Alerts Failed", counters.get("alerts.failed", 0))
+    col4.metric("Alerts Rate-limited", counters.get("alerts.rate_limited", 0))
+
+    stats = pd.DataFrame(telemetry.snapshot())
+    if stats.empty:
+        st.info("Nothing recorded yet.")
+    else:
+        latency = ["mean", "p50", "p95", "p99", "max"]
+        table = stats.copy()
+        table[latency] = table[latency] * 1000
+        table["total"] = table["total"].round(2)
+        st.dataframe(
+            table.rename(columns={c: f"{c} (ms)" for c in latency}).rename(columns={"total": "total (s)"}),
+            use_container_width=True, hide_index=True,
+        )
+        fig = px.bar(table.sort_values("p95"), x="p95", y="operation", orientation="h",
+                     hover_data=["calls", "rows", "mean"], labels={"p95": "p95 latency (ms)"},
+                     title="p95 Latency by Operation")
+        st.plotly_chart(fig, use_container_width=True)
+
+    with st.expander("Prometheus export"):
+        if metrics_port:
+            st.caption(f"Scrape http://127.0.0.1:{metrics_port}/metrics")
+        else:
+            st.caption("Set METRICS_PORT in secrets to serve this from a local endpoint.")
+        st.code(telemetry.prometheus(), language="text")
+
+    if st.button("Reset counters"):
+        telemetry.reset()
+        st.rerun()
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from core.schemas import SCHEMAS
+
+# --- Columnar Ring Buffer ---
+# Each column is a NumPy array of 2 * capacity slots and every row is written
+# twice (slot i and i + capacity), so the live window is always one contiguous
+# slice: appends are in place and views never copy, no matter where the head is.
+
+LIVE_CAPACITY = 1000
+GROUND_TRUTH_FIELD = "is_attack"  # optional label on incoming records; NaN when absent
+LIVE_SCHEMAS = {
+    schema.label: {**schema.dtypes, "anomaly": "int8", "reconstruction_error": "float64", GROUND_TRUTH_FIELD: "float64"}
+    for schema in SCHEMAS.values()
+}
+
+
+def _to_naive_ns(values):
+    ts = pd.to_datetime(pd.Series(values), utc=True, format="mixed")
+    return ts.dt.tz_localize(None).to_numpy(dtype="datetime64[ns]")
+
+
+class ColumnarRingBuffer:
+    def __init__(self, capacity, schema):
+        self.capacity = capacity
+        self.schema = dict(schema)
+        self._data = {name: np.zeros(2 * capacity, dtype=dtype) for name, dtype in self.schema.items()}
+        self._start = 0
+        self.size = 0
+        self.total = 0  # rows ever appended; lets consumers ask "what is new since N"
+
+    def __len__(self):
+        return self.size
+
+    def append(self, rows):
+        """Append a DataFrame, dict of columns or list of dicts; the oldest rows fall off."""
+        if isinstance(rows, list):
+            rows = pd.DataFrame(rows)
+        n = len(rows)
+        if n == 0:
+            return 0
+        keep = min(n, self.capacity)
+        end = self._start + self.size
+        slots = (end + np.arange(keep)) % self.capacity
+        for name, dtype in self.schema.items():
+            if name in rows:
+                values = rows[name]
+            else:
+                values = np.full(n, np.nan if dtype.startswith("float") else 0, dtype=dtype)
+            values = _to_naive_ns(values) if dtype.startswith("datetime64") else np.asarray(values, dtype=dtype)
+            values = values[n - keep:]
+            column = self._data[name]
+            column[slots] = values
+            column[slots + self.capacity] = values
+        overflow = max(self.size + keep - self.capacity, 0)
+        self._start = (self._start + overflow) % self.capacity
+        self.size = min(self.size + keep, self.capacity)
+        self.total += n
+        return n
+
+    def frame(self, since_total=None):
+        """DataFrame over views of the live window; `since_total` limits it to rows appended after that mark."""
+        start, stop = self._start, self._start + self.size
+        if since_total is not None:
+            start = max(start, stop - (self.total - since_total))
+        return pd.DataFrame({name: col[start:stop] for name, col in self._data.items()}, copy=False)
+
+    def clear(self):
+        self._start = 0
+        self.size = 0
+
+
+# --- Session Buffers ---
+def get_live_buffer(data_type):
+    """Per-session, per-traffic-type prediction history."""
+    buffers = st.session_state.setdefault("live_buffers", {})
+    if data_type not in buffers:
+        buffers[data_type] = ColumnarRingBuffer(LIVE_CAPACITY, LIVE_SCHEMAS[data_type])
+    return buffers[data_type]
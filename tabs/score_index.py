@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+# --- Sorted Score Index ---
+# Scores of a window are sorted once; anomaly counts and the confusion matrix
+# at any threshold are then a binary search plus a lookup into precomputed
+# cumulative label counts. A row is flagged when score > threshold, the same
+# rule the models use.
+
+
+class ScoreIndex:
+    def __init__(self, scores, labels=None):
+        scores = np.nan_to_num(np.asarray(scores, dtype=float), nan=0.0)
+        self.order = np.argsort(scores, kind="stable")  # row positions, lowest score first
+        self.scores = scores[self.order]
+        self.n = len(scores)
+        self.pos_above = self.neg_above = None
+        self._curve = None
+        if labels is not None:
+            labels = np.asarray(labels, dtype=float)[self.order]
+            known = ~np.isnan(labels)
+            positive = (known & (labels == 1)).astype(np.int64)
+            negative = (known & (labels == 0)).astype(np.int64)
+            # pos_above[i]: labelled attacks among sorted rows i..n-1
+            self.pos_above = np.concatenate([np.cumsum(positive[::-1])[::-1], [0]])
+            self.neg_above = np.concatenate([np.cumsum(negative[::-1])[::-1], [0]])
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def has_labels(self):
+        return self.pos_above is not None and self.pos_above[0] > 0 and self.neg_above[0] > 0
+
+    def _cut(self, threshold):
+        return int(np.searchsorted(self.scores, threshold, side="right"))
+
+    def count_above(self, threshold):
+        return self.n - self._cut(threshold)
+
+    def rate_above(self, threshold):
+        return self.count_above(threshold) / self.n if self.n else 0.0
+
+    def rows_above(self, threshold):
+        """Row positions flagged at `threshold`, highest score last."""
+        return self.order[self._cut(threshold):]
+
+    def confusion_at(self, threshold):
+        """2x2 [[tn, fp], [fn, tp]] over labelled rows."""
+        cut = self._cut(threshold)
+        tp, fp = self.pos_above[cut], self.neg_above[cut]
+        fn, tn = self.pos_above[0] - tp, self.neg_above[0] - fp
+        return np.array([[tn, fp], [fn, tp]])
+
+    def sweep(self):
+        """Operating point at every distinct score threshold, in one vectorized pass (memoized)."""
+        if self._curve is not None:
+            return self._curve
+        # Cutting just below each distinct score flags that score and everything above it.
+        starts = np.flatnonzero(np.r_[True, self.scores[1:] != self.scores[:-1]])
+        curve = pd.DataFrame({
+            "threshold": np.r_[np.nextafter(self.scores[starts], -np.inf), self.scores[-1:]],
+            "flagged": self.n - np.r_[starts, self.n],
+        })
+        if self.pos_above is not None:
+            cuts = np.r_[starts, self.n]
+            tp, fp = self.pos_above[cuts], self.neg_above[cuts]
+            positives, negatives = self.pos_above[0], self.neg_above[0]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                curve["precision"] = np.where(tp + fp > 0, tp / (tp + fp), 1.0)
+                curve["recall"] = tp / positives if positives else 0.0
+                curve["fpr"] = fp / negatives if negatives else 0.0
+        self._curve = curve
+        return curve
+
+
+def auc(x, y):
+    order = np.argsort(x, kind="stable")
+    x, y = np.asarray(x, dtype=float)[order], np.asarray(y, dtype=float)[order]
+    return float(np.sum(np.diff(x) * (y[1:] + y[:-1]) / 2))
@@ -0,0 +1,119 @@
+# --- Background Ingestion/Scoring Worker ---
+# Tails InfluxDB, scores new points in batches and writes them to the
+# prediction store, independently of any Streamlit session. While it is
+# running the Live Stream tab switches to a read-only view of its output.
+# Run with: python worker.py [--backend local] [--interval 5] [--metrics-port 9108]
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from core import (SCHEMAS, AlertSink, FeaturePipeline, InfluxSource, StoreSink, get_influx_client, get_scorer,
+                  get_store, load_config)
+from core.alerts import get_dispatcher
+from core.config import DATABASE_PATH, INGEST_WORKER_NAME
+from core.influx_tail import TailCursor
+from core.retention import start_rollup_worker
+from core.telemetry import start_metrics_server
+
+BATCH_ROWS = 5000
+
+
+class IngestWorker:
+    def __init__(self, config, backend="remote", initial_range="-5m"):
+        self.config = config
+        self.backend = backend
+        client = get_influx_client(config["INFLUXDB_URL"], config["INFLUXDB_TOKEN"], config["INFLUXDB_ORG"])
+        self.store = get_store(DATABASE_PATH)
+        self.dispatcher = get_dispatcher(config.get("DISCORD_WEBHOOK"))
+        self.sources, self.scorers, self.sinks, self.cursors, self.pipelines = {}, {}, {}, {}, {}
+        for kind, schema in SCHEMAS.items():
+            self.sources[kind] = InfluxSource(client, schema)
+            self.scorers[kind] = get_scorer(schema, backend, config["PREDICT_API_URL"], config["MODEL_VERSION"],
+                                            config.get("PREDICTION_CACHE_DB"))
+            self.sinks[kind] = [StoreSink(self.store, schema), AlertSink(self.dispatcher, schema)]
+            # Resume after the newest stored prediction instead of re-scoring the initial window.
+            cursor = TailCursor(initial_range=initial_range)
+            latest = self.store.latest_timestamp(kind)
+            if latest is not None:
+                cursor.last_time = latest.tz_localize("UTC")
+            self.cursors[kind] = cursor
+            # Rolling features continue from the newest stored rows rather than starting cold;
+            # None when the model only reads raw fields
+            pipeline = None
+            if self.scorers[kind].derived_features:
+                pipeline = FeaturePipeline(schema.features)
+                pipeline.transform(self.store.read_latest(kind, limit=pipeline.warmup_rows))
+            self.pipelines[kind] = pipeline
+
+    def poll(self, kind):
+        cursor, pipeline = self.cursors[kind], self.pipelines[kind]
+        store_sink, alert_sink = self.sinks[kind]
+        stored = 0
+        since = cursor.last_time  # every chunk of this poll is filtered against the same position
+        for chunk in self.sources[kind].iter_chunks(cursor.start_range(), chunk_rows=BATCH_ROWS, tags=True):
+            previous = cursor.last_time
+            new_rows = cursor.advance(chunk, since=since)
+            if new_rows.empty:
+                continue
+            state = pipeline.snapshot() if pipeline else None
+            scored, ok = self.scorers[kind].score_frame(pipeline.transform(new_rows) if pipeline else new_rows)
+            if not ok.all():
+                # Keep rows strictly older than the first failure and retry the rest on the next poll.
+                # Other series' rows at the failed timestamp are retried too: the cursor filter is
+                # strictly newer, so it must stop before that timestamp, not on it.
+                times = new_rows["timestamp"]
+                failed_time = times.iloc[int(np.argmin(ok))]
+                keep = int((times < failed_time).sum())  # rows are time-ordered
+                if keep:
+                    cursor.last_time = times.iloc[keep - 1]
+                elif previous is not None:
+                    cursor.last_time = min(previous, failed_time - pd.Timedelta(1, "ns"))
+                else:
+                    cursor.last_time = None
+                scored = scored.iloc[:keep]
+                if pipeline:
+                    pipeline.restore(state)
+                    pipeline.transform(new_rows.iloc[:keep])
+            stored += store_sink.write(scored)
+            alert_sink.write(scored)
+            if not ok.all():
+                break
+        return stored
+
+    def run(self, interval=5.0, once=False):
+        start_rollup_worker(self.store)
+        while True:
+            started = time.time()
+            for kind in SCHEMAS:
+                try:
+                    rows = self.poll(kind)
+                    if rows:
+                        print(f"{pd.Timestamp.now():%H:%M:%S} {kind}: stored {rows} predictions")
+                except Exception as e:
+                    print(f"{kind} poll failed: {e}")
+                    rows = 0
+                self.store.heartbeat(INGEST_WORKER_NAME, rows)
+            if once:
+                if self.dispatcher is not None:
+                    self.dispatcher.flush(timeout=30)
+                return
+            time.sleep(max(interval - (time.time() - started), 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tail InfluxDB, score new points and store predictions.")
+    parser.add_argument("--backend", choices=["remote", "local"], default="remote")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between polls")
+    parser.add_argument("--initial-range", default="-5m", help="window to read when the store is empty")
+    parser.add_argument("--once", action="store_true", help="run a single poll and exit")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this local port")
+    args = parser.parse_args()
+    config = load_config()
+    metrics_port = args.metrics_port or config.get("METRICS_PORT")
+    if metrics_port:
+        start_metrics_server(metrics_port)
+    IngestWorker(config, backend=args.backend, initial_range=args.initial_range).run(args.interval, args.once)
+
+
+if __name__ == "__main__":
+    main()